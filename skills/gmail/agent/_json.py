@@ -0,0 +1,39 @@
+"""
+JSON helpers shared by the agent modules.
+
+Uses orjson when it is installed (the `fast` extra) and the stdlib json
+module otherwise.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used otherwise
+    orjson = None
+
+# Whether loads() accepts memoryview slices without copying them
+HAVE_ORJSON = orjson is not None
+
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj as compact (or indented) JSON bytes."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if pretty else None).encode('utf-8')
+
+
+def dumps_line(obj: Any) -> bytes:
+    """Serialize obj as one newline-terminated JSON line."""
+    return dumps(obj) + b"\n"
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from bytes, str or (with orjson) a memoryview."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
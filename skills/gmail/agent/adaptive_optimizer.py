@@ -5,15 +5,214 @@ Automatically optimizes execution parameters based on dataset size,
 available budget, and goal complexity.
 """
 
+from bisect import bisect_right
+from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple
-from .goal_interpreter import Action
+from .goal_interpreter import Action, ActionKind
+
+
+# Base costs per action type (per email)
+_ACTION_COSTS = MappingProxyType({
+    'security_triage': 0.005,  # Expensive due to multiple LLM calls
+    'detect_attack_chains': 0.004,
+    'phishing_analysis': 0.004,
+    'classify_alerts': 0.003,
+    'inbox_triage': 0.003,
+    'weekly_summary': 0.002,
+    'find_action_items': 0.002,
+    'parallel_map': 0.003,
+    'llm_query': 0.002,
+    'chunk_by_sender': 0.0001,  # Cheap operations
+    'chunk_by_date': 0.0001,
+    'filter_by_keyword': 0.0001,
+})
+
+# Cost applied to functions missing from _ACTION_COSTS, and the per-email floor
+_DEFAULT_ACTION_COST = 0.001
+
+# _ACTION_COSTS flattened into a tuple indexed by ActionKind
+_COST_VEC: Tuple[float, ...] = tuple(
+    _ACTION_COSTS.get(kind.name.lower(), _DEFAULT_ACTION_COST) for kind in ActionKind
+)
+
+
+# Functions that fan out work across parallel workers
+_PARALLEL_FNS = frozenset({'parallel_map', 'parallel_llm_query'})
+
+# Multi-LLM-call workflows whose results are worth caching
+_EXPENSIVE_FNS = frozenset({'security_triage', 'detect_attack_chains', 'phishing_analysis'})
+
+# Prefixes of cheap local operations (no LLM calls)
+_LOCAL_FN_PREFIXES = ('chunk_', 'filter_')
+
+
+class WorkloadType(Enum):
+    """Coarse cost profile of an action plan."""
+    COMPUTE_INTENSIVE = 'compute_intensive'  # Multi-LLM-call workflows
+    IO_INTENSIVE = 'io_intensive'  # Only local chunk/filter operations
+    BALANCED = 'balanced'
+
+
+# Chunk/worker tables per workload. Below the first chunk threshold no chunking
+# is needed (chunk size = email count); chunk_sizes[i] applies once email count
+# reaches chunk_thresholds[i - 1], and likewise for worker_counts.
+_PROFILES: Dict[WorkloadType, Dict] = {
+    # Smaller chunks keep each LLM call's context small and spread work wider
+    WorkloadType.COMPUTE_INTENSIVE: {
+        'chunk_thresholds': (50, 200, 500),
+        'chunk_sizes': (None, 20, 25, 50),
+        'worker_thresholds': (100, 500),
+        'worker_counts': (3, 5, 10),
+    },
+    # No LLM calls per chunk, so fewer, larger chunks are cheapest
+    WorkloadType.IO_INTENSIVE: {
+        'chunk_thresholds': (200, 1000),
+        'chunk_sizes': (None, 100, 250),
+        'worker_thresholds': (),
+        'worker_counts': (1,),
+    },
+    WorkloadType.BALANCED: {
+        'chunk_thresholds': (50, 200, 500),
+        'chunk_sizes': (None, 25, 50, 100),
+        'worker_thresholds': (100, 500),
+        'worker_counts': (3, 5, 10),
+    },
+}
+
+
+# Context window (tokens) per model, used to cap parallel workers so the
+# combined worker returns plus the plan fit in one context
+_CONTEXT_WINDOWS = {
+    'claude-sonnet-4-20250514': 200_000,
+    'claude-haiku-4-5-20251001': 200_000,
+}
+_DEFAULT_CONTEXT_WINDOW = 200_000
+_WORKER_RETURN_CAP = 8192  # Max tokens a worker's result contributes
+_WORKER_DISPATCH_OVERHEAD = 1024  # Prompt tokens to dispatch one worker
+_WORKFLOW_OVERHEAD = 4096  # Plan and instructions
+_SAFE_HEADROOM = 16384
+
+
+def _context_worker_cap(context_window: int) -> int:
+    """Max workers whose returns fit in the context window."""
+    usable = context_window - _SAFE_HEADROOM - _WORKFLOW_OVERHEAD
+    return max(1, usable // (_WORKER_RETURN_CAP + _WORKER_DISPATCH_OVERHEAD))
+
+
+# Cost calibration: the gap between actual and estimated cost is learned per
+# (workload, workers) as an EMA. Until observed, parallel runs assume a flat
+# coordination overhead.
+_PARALLEL_OVERHEAD = 0.02
+_RESIDUAL_ALPHA = 0.2
+
+# Adaptive chunk sizing: once execution times have been observed for a plan,
+# size chunks so each takes about _TARGET_CHUNK_SECONDS
+_TARGET_CHUNK_SECONDS = 15.0
+_MIN_CHUNK_SIZE = 10
+_MAX_CHUNK_SIZE = 200
+_EMA_ALPHA = 0.3
+
+
+def _classify_workload(actions: List[Action]) -> WorkloadType:
+    """Classify an action plan into a WorkloadType."""
+    if any(action.function in _EXPENSIVE_FNS for action in actions):
+        return WorkloadType.COMPUTE_INTENSIVE
+    if actions and all(action.function.startswith(_LOCAL_FN_PREFIXES) for action in actions):
+        return WorkloadType.IO_INTENSIVE
+    return WorkloadType.BALANCED
+
+
+@lru_cache(maxsize=256)
+def _cost_per_email_for(kinds: Tuple[ActionKind, ...]) -> float:
+    """Sum per-email costs for a tuple of action kinds (memoized)."""
+    total_cost = sum(map(_COST_VEC.__getitem__, kinds))
+    return max(total_cost, _DEFAULT_ACTION_COST)
+
+
+@lru_cache(maxsize=256)
+def _estimate_cost_for(kinds: Tuple[ActionKind, ...], email_count: int) -> float:
+    """Estimate base cost (before learned residuals) for a tuple of action kinds (memoized)."""
+    # Base cost
+    total_cost = _cost_per_email_for(kinds) * email_count
+
+    # Add overhead for goal interpretation
+    goal_interpretation_cost = 0.01
+
+    return total_cost + goal_interpretation_cost
 
 
 class AdaptiveOptimizer:
     """Optimizes RLM execution parameters based on context."""
 
-    def __init__(self):
-        pass
+    def __init__(self, model: Optional[str] = None, max_workers: Optional[int] = None):
+        """
+        Initialize the optimizer.
+
+        Args:
+            model: Model the plan runs on (sets the context window worker cap)
+            max_workers: Fixed worker count overriding the heuristics
+        """
+        self.max_workers = max_workers
+        self._worker_cap = _context_worker_cap(
+            _CONTEXT_WINDOWS.get(model, _DEFAULT_CONTEXT_WINDOW)
+        )
+        # EMA of observed seconds per email, keyed by the plan's action kinds
+        self._seconds_per_email: Dict[Tuple[ActionKind, ...], float] = {}
+        # EMA of (actual - estimated) cost, keyed by (workload, max_workers)
+        self._residuals: Dict[Tuple[WorkloadType, int], float] = {}
+
+    def record_actual_cost(self, params: Dict, actual_cost: float):
+        """
+        Calibrate cost estimates against an observed execution cost.
+
+        Args:
+            params: Parameters returned by optimize_parameters for the run
+            actual_cost: Cost reported by the execution in USD
+        """
+        if 'cost_residual' not in params:
+            # Trivial plans are not estimated
+            return
+
+        key = (params['workload_type'], params['max_workers'])
+        base_cost = params['estimated_cost'] - params['cost_residual']
+        observed = actual_cost - base_cost
+        self._residuals[key] = (
+            _RESIDUAL_ALPHA * observed
+            + (1 - _RESIDUAL_ALPHA) * self._cost_residual(*key)
+        )
+
+    def _cost_residual(self, workload: WorkloadType, max_workers: int) -> float:
+        """Learned cost correction for a workload/worker combination."""
+        key = (workload, max_workers)
+        if key in self._residuals:
+            return self._residuals[key]
+        return _PARALLEL_OVERHEAD if max_workers > 1 else 0.0
+
+    def record_execution_time(
+        self,
+        actions: List[Action],
+        email_count: int,
+        seconds: float
+    ):
+        """
+        Record how long a plan took so later chunk sizes can adapt.
+
+        Args:
+            actions: Executed actions
+            email_count: Number of emails processed
+            seconds: Wall-clock execution time
+        """
+        if email_count <= 0 or seconds <= 0:
+            return
+
+        key = tuple(action.kind for action in actions)
+        rate = seconds / email_count
+        previous = self._seconds_per_email.get(key)
+        if previous is not None:
+            rate = _EMA_ALPHA * rate + (1 - _EMA_ALPHA) * previous
+        self._seconds_per_email[key] = rate
 
     def optimize_parameters(
         self,
@@ -33,32 +232,53 @@ class AdaptiveOptimizer:
 
         Returns:
             Dictionary with optimized parameters:
+            - workload_type: WorkloadType of the action plan
+            - model_tier: 'default' for plans running the multi-call security
+              workflows, else 'cheap'
             - chunk_size: Recommended chunk size
             - max_workers: Number of parallel workers
             - max_results: Max emails to fetch
             - estimated_cost: Estimated execution cost
             - warnings: List of warnings if any
         """
+        # Plans with no LLM calls cost nothing to run; skip the estimation
+        if not actions or all(action.function.startswith(_LOCAL_FN_PREFIXES) for action in actions):
+            return self._trivial_params(email_count)
+
         params = {}
         warnings = []
 
+        # Classify the plan to pick chunk/worker profiles
+        workload = _classify_workload(actions)
+        params['workload_type'] = workload
+
+        # Per-email summarize/extract/classify calls run on the cheap model;
+        # the multi-call security workflows keep the default one
+        params['model_tier'] = (
+            'default' if workload is WorkloadType.COMPUTE_INTENSIVE else 'cheap'
+        )
+
         # Optimize chunk size
-        params['chunk_size'] = self._optimize_chunk_size(email_count)
+        params['chunk_size'] = self._optimize_chunk_size(email_count, workload, actions)
 
         # Optimize parallel workers
-        params['max_workers'] = self._optimize_workers(email_count, actions)
+        params['max_workers'] = self._optimize_workers(email_count, actions, workload)
+
+        # Cost per email for the budget check below
+        cost_per_email = self._estimate_cost_per_email(actions)
 
         # Determine max results (may reduce if budget is tight)
         max_results, cost_warning = self._optimize_max_results(
-            email_count, actions, budget
+            email_count, actions, budget, cost_per_email=cost_per_email
         )
         params['max_results'] = max_results
         if cost_warning:
             warnings.append(cost_warning)
 
         # Estimate cost
+        params['cost_residual'] = self._cost_residual(workload, params['max_workers'])
         params['estimated_cost'] = self._estimate_cost(
-            max_results, actions, params['max_workers']
+            max_results, actions, params['max_workers'], workload
         )
 
         # Check if estimated cost exceeds budget
@@ -72,63 +292,88 @@ class AdaptiveOptimizer:
 
         return params
 
-    def _optimize_chunk_size(self, email_count: int) -> int:
+    def _trivial_params(self, email_count: int) -> Dict:
+        """Parameters for empty or chunk/filter-only plans (no LLM calls)."""
+        workload = WorkloadType.IO_INTENSIVE
+        return {
+            'workload_type': workload,
+            'model_tier': 'cheap',
+            'chunk_size': self._optimize_chunk_size(email_count, workload),
+            'max_workers': 1,
+            'max_results': email_count,
+            'estimated_cost': 0.0,
+            'warnings': [],
+        }
+
+    def _optimize_chunk_size(
+        self,
+        email_count: int,
+        workload: WorkloadType = WorkloadType.BALANCED,
+        actions: Optional[List[Action]] = None
+    ) -> int:
         """
         Determine optimal chunk size based on email count.
 
+        Uses the measured per-email time for this plan when available,
+        otherwise falls back to the workload's static thresholds.
+
         Args:
             email_count: Number of emails
+            workload: Workload type of the action plan
+            actions: Planned actions (used to look up measured timings)
 
         Returns:
             Recommended chunk size
         """
-        if email_count < 50:
-            # No chunking needed for small datasets
-            return email_count
-        elif email_count < 200:
-            # Small chunks for better parallelization
-            return 25
-        elif email_count < 500:
-            # Medium chunks
-            return 50
-        else:
-            # Larger chunks for efficiency
-            return 100
-
-    def _optimize_workers(self, email_count: int, actions: List[Action]) -> int:
+        if actions is not None:
+            rate = self._seconds_per_email.get(tuple(action.kind for action in actions))
+            if rate:
+                chunk_size = int(_TARGET_CHUNK_SECONDS / rate)
+                chunk_size = max(_MIN_CHUNK_SIZE, min(_MAX_CHUNK_SIZE, chunk_size))
+                return min(email_count, chunk_size)
+
+        profile = _PROFILES[workload]
+        idx = bisect_right(profile['chunk_thresholds'], email_count)
+        return email_count if idx == 0 else profile['chunk_sizes'][idx]
+
+    def _optimize_workers(
+        self,
+        email_count: int,
+        actions: List[Action],
+        workload: WorkloadType = WorkloadType.BALANCED
+    ) -> int:
         """
         Determine optimal number of parallel workers.
 
         Args:
             email_count: Number of emails
             actions: Planned actions
+            workload: Workload type of the action plan
 
         Returns:
             Recommended number of workers
         """
         # Check if any action uses parallel processing
-        uses_parallel = any(
-            action.function in ['parallel_map', 'parallel_llm_query']
-            for action in actions
-        )
+        uses_parallel = any(action.function in _PARALLEL_FNS for action in actions)
 
         if not uses_parallel:
             # No parallel processing, workers don't matter
             return 1
 
-        # Determine workers based on dataset size
-        if email_count < 100:
-            return 3
-        elif email_count < 500:
-            return 5
-        else:
-            return 10
+        if self.max_workers is not None:
+            return self.max_workers
+
+        # Determine workers based on dataset size, capped by the context window
+        profile = _PROFILES[workload]
+        workers = profile['worker_counts'][bisect_right(profile['worker_thresholds'], email_count)]
+        return min(workers, self._worker_cap)
 
     def _optimize_max_results(
         self,
         email_count: int,
         actions: List[Action],
-        budget: float
+        budget: float,
+        cost_per_email: Optional[float] = None
     ) -> Tuple[int, Optional[str]]:
         """
         Determine maximum number of emails to fetch based on budget.
@@ -137,12 +382,14 @@ class AdaptiveOptimizer:
             email_count: Requested number of emails
             actions: Planned actions
             budget: Available budget
+            cost_per_email: Precomputed cost per email (computed if omitted)
 
         Returns:
             Tuple of (max_results, warning_message)
         """
         # Estimate cost per email for the given actions
-        cost_per_email = self._estimate_cost_per_email(actions)
+        if cost_per_email is None:
+            cost_per_email = self._estimate_cost_per_email(actions)
 
         # Calculate max emails we can afford
         max_affordable = int(budget / cost_per_email)
@@ -166,63 +413,39 @@ class AdaptiveOptimizer:
         Returns:
             Estimated cost per email in USD
         """
-        # Base costs per action type (per email)
-        action_costs = {
-            'security_triage': 0.005,  # Expensive due to multiple LLM calls
-            'detect_attack_chains': 0.004,
-            'phishing_analysis': 0.004,
-            'classify_alerts': 0.003,
-            'inbox_triage': 0.003,
-            'weekly_summary': 0.002,
-            'find_action_items': 0.002,
-            'parallel_map': 0.003,
-            'llm_query': 0.002,
-            'chunk_by_sender': 0.0001,  # Cheap operations
-            'chunk_by_date': 0.0001,
-            'filter_by_keyword': 0.0001,
-        }
-
-        total_cost = 0.0
-        for action in actions:
-            cost = action_costs.get(action.function, 0.001)  # Default to 0.001
-            total_cost += cost
-
-        # Return total cost per email
-        return max(total_cost, 0.001)  # Minimum 0.001 per email
+        return _cost_per_email_for(tuple(action.kind for action in actions))
 
     def _estimate_cost(
         self,
         email_count: int,
         actions: List[Action],
-        max_workers: int
+        max_workers: int,
+        workload: Optional[WorkloadType] = None
     ) -> float:
         """
         Estimate total execution cost.
 
+        The base estimate is memoized on the plan's action kinds, so repeated
+        turns with the same plan reduce to a cache lookup; the learned
+        residual for the workload and worker count is added on top.
+
         Args:
             email_count: Number of emails
             actions: Planned actions
             max_workers: Number of parallel workers
+            workload: Workload type of the plan (classified if omitted)
 
         Returns:
             Estimated total cost in USD
         """
-        cost_per_email = self._estimate_cost_per_email(actions)
-
-        # Base cost
-        total_cost = cost_per_email * email_count
-
-        # Add overhead for goal interpretation
-        goal_interpretation_cost = 0.01
-
-        # Add overhead for parallel processing (slight increase due to coordination)
-        if max_workers > 1:
-            parallel_overhead = 0.02
-            total_cost += parallel_overhead
+        if workload is None:
+            workload = _classify_workload(actions)
 
-        total_cost += goal_interpretation_cost
+        kinds = tuple(action.kind for action in actions)
+        total_cost = _estimate_cost_for(kinds, email_count)
+        total_cost += self._cost_residual(workload, max_workers)
 
-        return round(total_cost, 2)
+        return round(max(total_cost, 0.0), 2)
 
     def suggest_optimizations(
         self,
@@ -260,11 +483,7 @@ class AdaptiveOptimizer:
             )
 
         # If using expensive operations, suggest caching
-        expensive_actions = [
-            action for action in actions
-            if action.function in ['security_triage', 'detect_attack_chains', 'phishing_analysis']
-        ]
-        if expensive_actions:
+        if any(action.function in _EXPENSIVE_FNS for action in actions):
             suggestions.append(
                 "This analysis uses expensive operations. Results will be cached for 24 hours."
             )
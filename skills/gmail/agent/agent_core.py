@@ -23,7 +23,10 @@ class AgentCore:
         self,
         model: str = "claude-sonnet-4-20250514",
         output_format: str = "text",
-        debug: bool = False
+        debug: bool = False,
+        cheap_model: str = "claude-haiku-4-5-20251001",
+        max_workers: Optional[int] = None,
+        pretty_json: bool = False
     ):
         """
         Initialize the agent.
@@ -32,16 +35,25 @@ class AgentCore:
             model: LLM model to use
             output_format: Output format ('text', 'json', 'html')
             debug: Enable debug mode (shows generated code)
+            cheap_model: Model for plans without the security workflows
+            max_workers: Fixed parallel worker count (default: auto-tuned)
+            pretty_json: Indent JSON output
         """
         self.model = model
         self.debug = debug
+        # Debug output; arguments are only formatted when debug is on
+        self._log = print if debug else (lambda *args, **kwargs: None)
+        # Model per optimizer tier ('cheap' plans skip the heavier model)
+        self._tier_models = {'cheap': cheap_model, 'default': model}
+        # JSON/HTML output is meant to be machine-read; skip status chatter
+        self._quiet = output_format != 'text'
 
         # Initialize components
         self.state_manager = StateManager()
         self.goal_interpreter = GoalInterpreter(model=model)
-        self.orchestrator = FunctionOrchestrator()
-        self.formatter = ResultFormatter(format=output_format)
-        self.optimizer = AdaptiveOptimizer()
+        self.orchestrator = FunctionOrchestrator(on_progress=self._log)
+        self.formatter = ResultFormatter(format=output_format, pretty=pretty_json)
+        self.optimizer = AdaptiveOptimizer(model=model, max_workers=max_workers)
 
     def run_agent_mode(
         self,
@@ -99,36 +111,46 @@ class AgentCore:
                 # Update session
                 session.add_turn(current_goal, response, cost)
 
-                # Display response
-                print(response)
-                print()
+                # Collect the turn's output and write it in one go
+                buf = [response, ""]
+
+                # Another goal is only asked for if budget remains
+                will_prompt = interactive and session.budget_remaining > 0
 
-                # Show suggested follow-ups (if in interactive mode)
-                if interactive:
+                # Show suggested follow-ups (only when the user is about to be prompted)
+                if will_prompt and not self._quiet:
                     # Parse the result data to suggest follow-ups
                     # (This is a simplified version - in production, we'd extract data from the response)
                     suggestions = self.formatter.suggest_follow_ups({}, current_goal)
                     if suggestions:
-                        print("Suggested follow-ups:")
+                        buf.append("Suggested follow-ups:")
                         for i, suggestion in enumerate(suggestions, 1):
-                            print(f"  {i}. {suggestion}")
-                        print()
+                            buf.append(f"  {i}. {suggestion}")
+                        buf.append("")
 
                 # Save session
                 session_file = self.state_manager.save_session(session)
-                print(f"Session saved: {session_file}")
-                print(f"Budget used: ${session.budget_used:.4f} | Remaining: ${session.budget_remaining:.4f}")
-                print()
+                if not self._quiet:
+                    buf.append(f"Session saved: {session_file}")
+                    buf.append(f"Budget used: ${session.budget_used:.4f} | Remaining: ${session.budget_remaining:.4f}")
+                    buf.append("")
+
+                sys.stdout.write("\n".join(buf) + "\n")
+                sys.stdout.flush()
 
                 # Multi-turn dialogue
-                if interactive and session.budget_remaining > 0:
+                if will_prompt:
+                    # Fetch the next turn's emails while the user types
+                    self.orchestrator.prefetch(query, max_results)
                     try:
                         next_goal = input("> ").strip()
                         if not next_goal or next_goal.lower() in ['done', 'exit', 'quit']:
+                            self.orchestrator.cancel_prefetch()
                             print("Session ended. Use --resume to continue later.")
                             break
                         current_goal = next_goal
                     except (EOFError, KeyboardInterrupt):
+                        self.orchestrator.cancel_prefetch()
                         print("\nSession ended. Use --resume to continue later.")
                         break
                 else:
@@ -136,6 +158,7 @@ class AgentCore:
                     break
 
             except Exception as e:
+                self.orchestrator.cancel_prefetch()
                 error_msg = f"Error: {str(e)}"
                 print(error_msg)
                 session.add_turn(current_goal, error_msg, 0.0)
@@ -165,6 +188,12 @@ class AgentCore:
         Returns:
             Tuple of (response_text, cost)
         """
+        # Fetch emails in the background while the goal is interpreted
+        # (reuses a prefetch already started at the prompt)
+        self.orchestrator.prefetch(query, max_results)
+        # Likewise start the RLM worker, if none is idle yet
+        self.orchestrator.warm_up()
+
         # Step 1: Interpret goal
         print("Interpreting goal...")
         try:
@@ -175,11 +204,11 @@ class AgentCore:
                 query_info={'query': query, 'max_results': max_results}
             )
         except Exception as e:
+            self.orchestrator.cancel_prefetch()
             return f"Failed to interpret goal: {str(e)}", 0.0
 
-        if self.debug:
-            print(f"\nReasoning: {reasoning}")
-            print(f"Planned actions: {[str(a) for a in actions]}\n")
+        self._log("\nReasoning:", reasoning)
+        self._log("Planned actions:", *actions, end="\n\n")
 
         # Step 2: Optimize parameters
         print("Optimizing parameters...")
@@ -204,34 +233,48 @@ class AgentCore:
         # Ask for confirmation if cost is high
         if estimated_cost > max_budget * 0.5:  # More than 50% of budget
             print(f"This operation will use ~{(estimated_cost / max_budget) * 100:.0f}% of your budget.")
+            # Start fetching while waiting for confirmation
+            self.orchestrator.prefetch(query, optimized_params['max_results'])
             try:
                 confirm = input("Continue? (y/n): ").strip().lower()
                 if confirm != 'y':
+                    self.orchestrator.cancel_prefetch()
                     return "Operation cancelled by user.", 0.0
             except (EOFError, KeyboardInterrupt):
+                self.orchestrator.cancel_prefetch()
                 return "Operation cancelled by user.", 0.0
 
         # Step 3: Execute actions
+        model = self._tier_models[optimized_params['model_tier']]
         print("Executing...")
+        if model != self.model:
+            self._log("Using", model, "for this plan")
         result = self.orchestrator.execute(
             actions=actions,
             query=query,
             max_results=optimized_params['max_results'],
             max_budget=max_budget,
-            model=self.model
+            model=model
         )
 
         if self.debug and result.generated_code:
-            print("\nGenerated code:")
-            print("-" * 50)
-            print(result.generated_code)
-            print("-" * 50)
-            print()
+            self._log("\nGenerated code:")
+            self._log("-" * 50)
+            self._log(result.generated_code)
+            self._log("-" * 50)
+            self._log()
 
         # Step 4: Format result
         if not result.success:
             return f"Execution failed: {result.error}", 0.0
 
+        # Feed timing and cost back so later turns adapt chunk sizes and
+        # cost estimates
+        self.optimizer.record_execution_time(
+            actions, result.emails_processed, result.execution_time
+        )
+        self.optimizer.record_actual_cost(optimized_params, result.cost)
+
         context = {
             'cost': result.cost,
             'execution_time': result.execution_time
@@ -302,17 +345,14 @@ class AgentCore:
 
         lines = []
         lines.append("Available Sessions:")
-        lines.append("─" * 80)
-        lines.append(f"{'Session ID':<30} {'Created':<20} {'Turns':<8} {'Budget Used':<12} {'Budget Left'}")
-        lines.append("─" * 80)
+        lines.append("─" * 84)
+        lines.append(f"{'Session ID':<34} {'Created':<20} {'Turns':<8} {'Budget Used':<12} {'Budget Left'}")
+        lines.append("─" * 84)
 
-        for session in sessions:
+        for s in sessions:
             lines.append(
-                f"{session['session_id']:<30} "
-                f"{session['created_at'][:19]:<20} "
-                f"{session['turns']:<8} "
-                f"${session['budget_used']:<11.4f} "
-                f"${session['budget_remaining']:.4f}"
+                f"{s.session_id:<34} {s.created_at[:19]:<20} {s.turns:<8} "
+                f"${s.budget_used:<11.4f} ${s.budget_remaining:.4f}"
             )
 
         return "\n".join(lines)
@@ -1,19 +1,91 @@
 """
 Function Orchestrator for Gmail Agent
 
-Executes RLM functions by generating Python code and calling gmail_rlm_repl.py.
+Executes RLM functions by generating Python code and running it in a
+long-lived gmail_rlm_repl.py --server process.
 Handles error recovery, retries, and result parsing.
 """
 
 import ast
 import json
+import os
+import random
+import re
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from .goal_interpreter import Action
 
+from ._json import dumps_line as _dumps_line, loads as _loads
+
+
+# Action args that name RLM environment variables rather than string values
+_VARIABLE_REFS = frozenset({'emails', 'llm_query'})
+
+def _arg_node(value: Any) -> ast.expr:
+    """AST node for an action argument (a variable reference or a literal)."""
+    if isinstance(value, str) and value in _VARIABLE_REFS:
+        return ast.Name(id=value, ctx=ast.Load())
+    return _literal_node(value)
+
+
+def _literal_node(value: Any) -> ast.expr:
+    """AST node for a JSON-style literal value."""
+    if isinstance(value, list):
+        return ast.List(elts=[_literal_node(item) for item in value], ctx=ast.Load())
+    if isinstance(value, dict):
+        return ast.Dict(
+            keys=[ast.Constant(value=key) for key in value],
+            values=[_literal_node(item) for item in value.values()]
+        )
+    return ast.Constant(value=value)
+
+
+# Lines of RLM worker stderr kept for error messages
+_STDERR_TAIL_LINES = 50
+
+
+def _drain_stderr(worker: subprocess.Popen):
+    """Keep the last lines of a worker's stderr without letting the pipe fill."""
+    for line in iter(worker.stderr.readline, b''):
+        worker.stderr_tail.append(line)
+    worker.stderr.close()
+
+
+def _stderr_tail(worker: subprocess.Popen) -> str:
+    """The end of a stopped worker's stderr, for error messages."""
+    worker.stderr_thread.join(timeout=1)
+    tail = b''.join(worker.stderr_tail).decode('utf-8', 'replace').strip()
+    return tail[-500:]
+
+
+# Error signatures worth retrying; anything else (bad generated code,
+# missing credentials, budget exceeded) fails the same way every time.
+# "worker exited" only appears for workers that had already served a
+# request; a fresh worker dying is usually a startup failure
+_TRANSIENT_ERROR = re.compile(
+    r"rate.?limit|overloaded|timed? ?out|\b(?:429|502|503|529)\b"
+    r"|connection|temporarily|worker exited|failed to parse rlm output",
+    re.IGNORECASE
+)
+
+
+def _is_transient(message: str) -> bool:
+    """Whether an RLM error message looks like a retryable failure."""
+    return _TRANSIENT_ERROR.search(message) is not None
+
+
+def _backoff(attempt: int):
+    """Sleep before a retry: exponential backoff with jitter."""
+    time.sleep(2 ** attempt + random.random() * 0.5)
+
 
 class ExecutionResult:
     """Represents the result of executing RLM functions."""
@@ -25,7 +97,8 @@ class ExecutionResult:
         error: Optional[str] = None,
         cost: float = 0.0,
         execution_time: float = 0.0,
-        generated_code: str = ""
+        generated_code: str = "",
+        emails_processed: int = 0
     ):
         self.success = success
         self.data = data or {}
@@ -33,6 +106,7 @@ class ExecutionResult:
         self.cost = cost
         self.execution_time = execution_time
         self.generated_code = generated_code
+        self.emails_processed = emails_processed
 
     def to_dict(self) -> Dict:
         return {
@@ -41,14 +115,30 @@ class ExecutionResult:
             'error': self.error,
             'cost': self.cost,
             'execution_time': self.execution_time,
-            'generated_code': self.generated_code
+            'generated_code': self.generated_code,
+            'emails_processed': self.emails_processed
         }
 
 
 class FunctionOrchestrator:
     """Orchestrates execution of RLM functions."""
 
-    def __init__(self, scripts_dir: Optional[Path] = None, python_path: Optional[str] = None):
+    def __init__(
+        self,
+        scripts_dir: Optional[Path] = None,
+        python_path: Optional[str] = None,
+        on_progress: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Initialize the orchestrator.
+
+        Args:
+            scripts_dir: Directory containing the Gmail scripts
+            python_path: Python interpreter for the scripts (default: .venv or current)
+            on_progress: Called with each status message while RLM code runs
+        """
+        self.on_progress = on_progress
+
         if scripts_dir is None:
             # Assume scripts are in skills/gmail/scripts/
             self.scripts_dir = Path(__file__).parent.parent / 'scripts'
@@ -69,9 +159,223 @@ class FunctionOrchestrator:
         if not self.rlm_script.exists():
             raise FileNotFoundError(f"RLM script not found: {self.rlm_script}")
 
+        self.bulk_read_script = self.scripts_dir / 'gmail_bulk_read.py'
+
+        # Generated code per distinct plan; repeated plans skip code generation
+        self._code_for_plan = lru_cache(maxsize=256)(self._build_code)
+
+        # Background email prefetch: ((query, max_results), future -> file path)
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+        self._prefetch: Optional[Tuple[Tuple[str, int], Future]] = None
+        self._prefetch_proc: Optional[subprocess.Popen] = None
+        self._prefetch_cancelled = threading.Event()
+        self._prefetch_lock = threading.Lock()
+
+        # Idle long-lived `gmail_rlm_repl.py --server` processes; one is
+        # started per concurrently running script
+        self._workers: List[subprocess.Popen] = []
+        self._workers_lock = threading.Lock()
+
+    def _acquire_worker(self) -> subprocess.Popen:
+        """Take an idle RLM worker process, starting one if none is free."""
+        with self._workers_lock:
+            while self._workers:
+                worker = self._workers.pop()
+                if worker.poll() is None:
+                    return worker
+                self._stop_worker(worker)
+
+        return self._spawn_worker()
+
+    def _spawn_worker(self) -> subprocess.Popen:
+        """Start a new RLM worker process."""
+        worker = subprocess.Popen(
+            [self.python_path, str(self.rlm_script), '--server'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        # stderr is drained in the background; its tail explains crashes
+        worker.stderr_tail = deque(maxlen=_STDERR_TAIL_LINES)
+        worker.stderr_thread = threading.Thread(
+            target=_drain_stderr, args=(worker,), daemon=True
+        )
+        worker.stderr_thread.start()
+        worker.requests_served = 0
+        return worker
+
+    def warm_up(self, count: int = 1):
+        """
+        Start idle RLM workers ahead of time.
+
+        Worker startup (interpreter, anthropic/googleapiclient imports, local
+        model detection) then runs in the background, e.g. while a goal is
+        being interpreted, instead of delaying the first execution.
+
+        Args:
+            count: Number of idle workers to have ready
+        """
+        with self._workers_lock:
+            missing = count - sum(1 for worker in self._workers if worker.poll() is None)
+        for _ in range(missing):
+            self._release_worker(self._spawn_worker())
+
+    def _release_worker(self, worker: subprocess.Popen):
+        """Return a healthy RLM worker to the idle pool."""
+        with self._workers_lock:
+            self._workers.append(worker)
+
+    @staticmethod
+    def _stop_worker(worker: subprocess.Popen):
+        """Shut down an RLM worker process."""
+        try:
+            # EOF on stdin ends the server loop
+            worker.stdin.close()
+        except OSError:
+            pass
+        try:
+            worker.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+            worker.wait()
+        worker.stdout.close()
+
+    def close(self):
+        """Stop the RLM workers and any background prefetch."""
+        self.cancel_prefetch()
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=False)
+            self._prefetch_executor = None
+
+        with self._workers_lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            self._stop_worker(worker)
+
+    def __del__(self):
+        for worker in getattr(self, '_workers', ()):
+            self._stop_worker(worker)
+
+    def prefetch(self, query: str, max_results: int) -> Future:
+        """
+        Start fetching emails in the background for a later execute() call.
+
+        Lets the Gmail fetch overlap with the user's think time at a prompt.
+        execute() with the same query and max_results loads the prefetched
+        file instead of fetching again.
+
+        Args:
+            query: Gmail query string
+            max_results: Maximum number of emails to fetch
+
+        Returns:
+            Future resolving to the prefetched file path (None on failure)
+        """
+        key = (query, max_results)
+        if self._prefetch is not None and self._prefetch[0] == key:
+            return self._prefetch[1]
+
+        self.cancel_prefetch()
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(max_workers=1)
+
+        self._prefetch_cancelled = threading.Event()
+        future = self._prefetch_executor.submit(
+            self._run_prefetch, query, max_results, self._prefetch_cancelled
+        )
+        self._prefetch = (key, future)
+        return future
+
+    def cancel_prefetch(self):
+        """Cancel any pending prefetch and remove its file."""
+        if self._prefetch is None:
+            return
+
+        _, future = self._prefetch
+        self._prefetch = None
+
+        if not future.cancel():
+            # The fetch is running or about to start its process; the event
+            # covers the window before the process handle is published
+            with self._prefetch_lock:
+                self._prefetch_cancelled.set()
+                proc = self._prefetch_proc
+            if proc is not None and proc.poll() is None:
+                proc.kill()
+            path = future.result()
+            if path:
+                Path(path).unlink(missing_ok=True)
+
+    def _run_prefetch(
+        self,
+        query: str,
+        max_results: int,
+        cancelled: threading.Event
+    ) -> Optional[str]:
+        """Fetch emails to a temp file with gmail_bulk_read.py."""
+        fd, path = tempfile.mkstemp(prefix='gmail_agent_prefetch_', suffix='.json')
+        os.close(fd)
+
+        cmd = [
+            self.python_path,
+            str(self.bulk_read_script),
+            '--query', query,
+            '--max-results', str(max_results),
+            '--output-file', path,
+            '--quiet'
+        ]
+
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        with self._prefetch_lock:
+            if cancelled.is_set():
+                proc.kill()
+            self._prefetch_proc = proc
+        try:
+            returncode = proc.wait(timeout=300)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            returncode = None
+        finally:
+            with self._prefetch_lock:
+                self._prefetch_proc = None
+
+        if returncode != 0:
+            Path(path).unlink(missing_ok=True)
+            return None
+        return path
+
+    def _take_prefetched(self, query: str, max_results: int) -> Optional[str]:
+        """Claim the prefetched file for this query, waiting if still running."""
+        if self._prefetch is None:
+            return None
+        if self._prefetch[0] != (query, max_results):
+            # Stale prefetch (e.g. max_results reduced for budget)
+            self.cancel_prefetch()
+            return None
+
+        _, future = self._prefetch
+        self._prefetch = None
+        try:
+            return future.result()
+        except Exception:
+            return None
+
+    def _result_cost(self, result: Dict) -> float:
+        """Extract the LLM cost from RLM JSON output."""
+        if 'session' in result:
+            return result['session'].get('estimated_cost_usd', 0.0)
+        return result.get('session_stats', {}).get('total_cost', 0.0)
+
     def _parse_result(self, result_str: Any) -> Any:
         """
-        Parse RLM result, converting string representations to Python objects.
+        Parse RLM result, converting JSON strings to Python objects.
+
+        Structured FINAL() values already arrive as JSON values; this also
+        handles code that calls FINAL(json.dumps(...)).
 
         Args:
             result_str: Result from RLM (may be string, dict, list, etc.)
@@ -79,20 +383,13 @@ class FunctionOrchestrator:
         Returns:
             Parsed Python object
         """
-        # If already a dict or list, return as-is
-        if isinstance(result_str, (dict, list)):
-            return result_str
-
-        # If it's a string, try to parse it
-        if isinstance(result_str, str):
-            # Try to parse as Python literal (dict, list, etc.)
+        # Strings holding a JSON object/array (others are plain text results)
+        if isinstance(result_str, str) and result_str[:1] in ('{', '['):
             try:
-                return ast.literal_eval(result_str)
-            except (ValueError, SyntaxError):
-                # If that fails, return as-is (it's a plain string result)
-                return result_str
+                return _loads(result_str)
+            except json.JSONDecodeError:
+                pass
 
-        # For other types, return as-is
         return result_str
 
     def execute(
@@ -121,6 +418,77 @@ class FunctionOrchestrator:
         # Generate Python code from actions
         code = self._generate_code(actions)
 
+        # Use emails prefetched during the last prompt, if they match
+        load_file = self._take_prefetched(query, max_results)
+        try:
+            return self._execute_with_retries(
+                code, query, max_results, max_budget, model, max_retries, load_file
+            )
+        finally:
+            if load_file:
+                Path(load_file).unlink(missing_ok=True)
+
+    def execute_batch(
+        self,
+        action_batches: List[List[Action]],
+        query: str,
+        max_results: int,
+        max_budget: float,
+        model: str = "claude-sonnet-4-20250514",
+        max_retries: int = 3
+    ) -> List[ExecutionResult]:
+        """
+        Execute independent action lists concurrently.
+
+        Each list runs in its own RLM worker, so their LLM round trips
+        overlap instead of running back to back. Emails are fetched once and
+        shared, and the budget is split evenly between the lists.
+
+        Args:
+            action_batches: Independent lists of Action objects
+            query: Gmail query string
+            max_results: Maximum number of emails to fetch
+            max_budget: Total budget limit in USD
+            model: LLM model to use
+            max_retries: Number of retry attempts per list
+
+        Returns:
+            ExecutionResult per action list, in input order
+        """
+        if not action_batches:
+            return []
+
+        codes = [self._generate_code(actions) for actions in action_batches]
+        batch_budget = max_budget / len(codes)
+
+        if len(codes) > 1:
+            self.prefetch(query, max_results)
+        load_file = self._take_prefetched(query, max_results)
+        try:
+            with ThreadPoolExecutor(max_workers=len(codes)) as pool:
+                futures = [
+                    pool.submit(
+                        self._execute_with_retries, code, query, max_results,
+                        batch_budget, model, max_retries, load_file
+                    )
+                    for code in codes
+                ]
+                return [future.result() for future in futures]
+        finally:
+            if load_file:
+                Path(load_file).unlink(missing_ok=True)
+
+    def _execute_with_retries(
+        self,
+        code: str,
+        query: str,
+        max_results: int,
+        max_budget: float,
+        model: str,
+        max_retries: int,
+        load_file: Optional[str] = None
+    ) -> ExecutionResult:
+        """Run generated code through the RLM script, retrying on failure."""
         # Execute with retries
         for attempt in range(max_retries):
             try:
@@ -131,7 +499,8 @@ class FunctionOrchestrator:
                     query=query,
                     max_results=max_results,
                     max_budget=max_budget,
-                    model=model
+                    model=model,
+                    load_file=load_file
                 )
 
                 execution_time = time.time() - start_time
@@ -144,30 +513,34 @@ class FunctionOrchestrator:
                     return ExecutionResult(
                         success=True,
                         data=parsed_data,
-                        cost=result.get('session_stats', {}).get('total_cost', 0.0),
+                        cost=self._result_cost(result),
                         execution_time=execution_time,
-                        generated_code=code
+                        generated_code=code,
+                        emails_processed=result.get('emails_processed', 0)
                     )
                 else:
-                    # If this is the last attempt, return the error
-                    if attempt == max_retries - 1:
+                    message = result.get('message', 'Unknown error')
+
+                    # Return the error on the last attempt or if retrying
+                    # can't help
+                    if attempt == max_retries - 1 or not _is_transient(message):
                         return ExecutionResult(
                             success=False,
-                            error=result.get('message', 'Unknown error'),
+                            error=message,
                             generated_code=code
                         )
 
                     # Otherwise, wait and retry
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    _backoff(attempt)
 
             except Exception as e:
-                if attempt == max_retries - 1:
+                if attempt == max_retries - 1 or not _is_transient(str(e)):
                     return ExecutionResult(
                         success=False,
                         error=str(e),
                         generated_code=code
                     )
-                time.sleep(2 ** attempt)
+                _backoff(attempt)
 
         # Should never reach here, but just in case
         return ExecutionResult(
@@ -186,6 +559,10 @@ class FunctionOrchestrator:
         Returns:
             Python code string to execute in RLM environment
         """
+        return self._code_for_plan(tuple(actions))
+
+    def _build_code(self, actions: Tuple[Action, ...]) -> str:
+        """Build the Python code for a plan (cached by _generate_code)."""
         code_lines = []
 
         # Add header comment
@@ -194,15 +571,26 @@ class FunctionOrchestrator:
 
         # Generate code for each action
         for i, action in enumerate(actions):
-            code_lines.append(f"# Action {i + 1}: {action.description}")
-
-            # Build function call
-            func_name = action.function
-            args_str = self._format_args(action.args)
+            # (descriptions come from the LLM; keep them on one comment line)
+            description = " ".join(action.description.splitlines())
+            code_lines.append(f"# Action {i + 1}: {description}")
+
+            # Build the call as an AST so arguments are always valid literals
+            call = ast.Call(
+                func=ast.Name(id=action.function, ctx=ast.Load()),
+                args=[],
+                keywords=[
+                    ast.keyword(arg=key, value=_arg_node(value))
+                    for key, value in action.args.items()
+                ]
+            )
 
             # Store result in variable
-            result_var = f"result_{i}"
-            code_lines.append(f"{result_var} = {func_name}({args_str})")
+            assign = ast.Assign(
+                targets=[ast.Name(id=f"result_{i}", ctx=ast.Store())],
+                value=call
+            )
+            code_lines.append(ast.unparse(ast.fix_missing_locations(assign)))
             code_lines.append("")
 
         # Final output - use the last result
@@ -215,39 +603,17 @@ class FunctionOrchestrator:
 
         return "\n".join(code_lines)
 
-    def _format_args(self, args: Dict[str, Any]) -> str:
-        """Format function arguments for Python code."""
-        arg_parts = []
-        for key, value in args.items():
-            if isinstance(value, str):
-                # Check if it's a variable reference (like "emails") or a literal
-                if value in ['emails', 'llm_query']:
-                    arg_parts.append(f"{key}={value}")
-                else:
-                    # Escape quotes in string literals
-                    escaped_value = value.replace("'", "\\'")
-                    arg_parts.append(f"{key}='{escaped_value}'")
-            elif isinstance(value, (int, float)):
-                arg_parts.append(f"{key}={value}")
-            elif isinstance(value, bool):
-                arg_parts.append(f"{key}={str(value)}")
-            elif isinstance(value, (list, dict)):
-                arg_parts.append(f"{key}={repr(value)}")
-            else:
-                arg_parts.append(f"{key}={repr(value)}")
-
-        return ", ".join(arg_parts)
-
     def _execute_rlm_script(
         self,
         code: str,
         query: str,
         max_results: int,
         max_budget: float,
-        model: str
+        model: str,
+        load_file: Optional[str] = None
     ) -> Dict:
         """
-        Execute the RLM script with generated code.
+        Execute generated code in the persistent RLM worker.
 
         Args:
             code: Python code to execute
@@ -255,42 +621,85 @@ class FunctionOrchestrator:
             max_results: Maximum number of emails
             max_budget: Budget limit
             model: LLM model to use
+            load_file: Prefetched email file to load instead of running the query
 
         Returns:
             Parsed JSON result from RLM script
         """
-        # Build command
-        cmd = [
-            self.python_path,
-            str(self.rlm_script),
-            '--query', query,
-            '--max-results', str(max_results),
-            '--max-budget', str(max_budget),
-            '--model', model,
-            '--max-depth', '50',  # Set high depth for parallel processing
-            '--json-output',  # Request JSON output with session stats
-            '--code', code
-        ]
+        request = {
+            'code': code,
+            'max_results': max_results,
+            'max_budget': max_budget,
+            'model': model,
+            'max_depth': 50  # Set high depth for parallel processing
+        }
+        if load_file:
+            request['load_file'] = load_file
+        else:
+            request['query'] = query
 
-        # Execute command
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
+        worker = self._acquire_worker()
+
+        # 5 minute timeout: kill the worker, which ends the reads below
+        timed_out = threading.Event()
 
-        # Parse output
+        def kill_on_timeout():
+            timed_out.set()
+            worker.kill()
+
+        timer = threading.Timer(300, kill_on_timeout)
+        timer.start()
+        response = None
+        bad_line = None
         try:
-            # The script should output JSON
-            output = json.loads(result.stdout)
-            return output
-        except json.JSONDecodeError:
-            # If JSON parsing fails, return error
+            worker.stdin.write(_dumps_line(request))
+            worker.stdin.flush()
+
+            # Progress events stream in until the response line
+            for line in iter(worker.stdout.readline, b''):
+                try:
+                    message = _loads(line)
+                except json.JSONDecodeError:
+                    message = None
+                if not isinstance(message, dict):
+                    bad_line = line
+                    break
+                if 'status' in message:
+                    response = message
+                    break
+                if self.on_progress is not None:
+                    self.on_progress(message.get('message', ''))
+        except OSError:
+            pass
+        finally:
+            timer.cancel()
+
+        if response is not None:
+            worker.requests_served += 1
+            self._release_worker(worker)
+            return response
+
+        # Worker crashed, timed out or is out of sync; a fresh one is
+        # started next call
+        self._stop_worker(worker)
+        if bad_line is not None:
             return {
                 'status': 'error',
-                'message': f'Failed to parse RLM output. stdout: {result.stdout[:500]}, stderr: {result.stderr[:500]}'
+                'message': f"Failed to parse RLM output: {bad_line[:500].decode('utf-8', 'replace')}"
             }
+        if timed_out.is_set():
+            message = 'RLM worker timed out after 300s'
+        elif worker.requests_served:
+            message = 'RLM worker exited before returning a result'
+        else:
+            message = 'RLM worker failed on its first request'
+        stderr = _stderr_tail(worker)
+        if stderr:
+            message += f": {stderr}"
+        return {
+            'status': 'error',
+            'message': message
+        }
 
     def execute_custom_code(
         self,
@@ -333,9 +742,10 @@ class FunctionOrchestrator:
                 return ExecutionResult(
                     success=True,
                     data=parsed_data,
-                    cost=result.get('session_stats', {}).get('total_cost', 0.0),
+                    cost=self._result_cost(result),
                     execution_time=execution_time,
-                    generated_code=code
+                    generated_code=code,
+                    emails_processed=result.get('emails_processed', 0)
                 )
             else:
                 return ExecutionResult(
@@ -5,17 +5,79 @@ Converts natural language goals into RLM function execution plans.
 Uses LLM to analyze user intent and map to available functions.
 """
 
+import copy
 import json
 import os
+from enum import IntEnum, auto
 from typing import Dict, List, Optional, Tuple, Any
 from anthropic import Anthropic
 
+from ._json import loads as _loads
+
+
+class ActionKind(IntEnum):
+    """Known RLM functions, interned to small ints for table lookups."""
+    UNKNOWN = 0
+    # Security workflows
+    SECURITY_TRIAGE = auto()
+    DETECT_ATTACK_CHAINS = auto()
+    PHISHING_ANALYSIS = auto()
+    CLASSIFY_ALERTS = auto()
+    EXTRACT_IOCS = auto()
+    MAP_TO_MITRE = auto()
+    CORRELATE_BY_SOURCE_IP = auto()
+    DETECT_SUSPICIOUS_SENDERS = auto()
+    ANALYZE_ATTACHMENTS = auto()
+    EXTRACT_AND_ANALYZE_URLS = auto()
+    # General email workflows
+    INBOX_TRIAGE = auto()
+    WEEKLY_SUMMARY = auto()
+    FIND_ACTION_ITEMS = auto()
+    CHUNK_BY_SENDER = auto()
+    CHUNK_BY_DATE = auto()
+    CHUNK_BY_THREAD = auto()
+    CHUNK_BY_SIZE = auto()
+    FILTER_BY_KEYWORD = auto()
+    FILTER_BY_SENDER = auto()
+    PARALLEL_MAP = auto()
+    PARALLEL_LLM_QUERY = auto()
+    LLM_QUERY = auto()
+    # Data extraction
+    EXTRACT_FIELD = auto()
+    SUMMARIZE_THREAD = auto()
+    DETECT_PATTERNS = auto()
+
+    @classmethod
+    def from_function(cls, function: str) -> 'ActionKind':
+        """Look up the kind for a function name (UNKNOWN if not recognized)."""
+        return _ACTION_KINDS_BY_NAME.get(function, cls.UNKNOWN)
+
+
+_ACTION_KINDS_BY_NAME = {
+    kind.name.lower(): kind for kind in ActionKind if kind is not ActionKind.UNKNOWN
+}
+
+
+def _unknown_functions(actions: List['Action']) -> List[str]:
+    """Names of planned functions that are not RLM functions."""
+    return [action.function for action in actions if action.kind is ActionKind.UNKNOWN]
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable, key-order independent form of an action argument value."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
 
 class Action:
     """Represents a single RLM function call."""
 
     def __init__(self, function: str, args: Dict[str, Any], description: str = ""):
         self.function = function
+        self.kind = ActionKind.from_function(function)
         self.args = args
         self.description = description
 
@@ -34,93 +96,25 @@ class Action:
             description=data.get('description', '')
         )
 
-    def __repr__(self):
-        return f"Action({self.function}, {self.args})"
-
-
-class GoalInterpreter:
-    """Interprets natural language goals and generates RLM execution plans."""
-
-    def __init__(self, model: str = "claude-sonnet-4-20250514"):
-        self.model = model
-        api_key = os.environ.get('ANTHROPIC_API_KEY')
-        if not api_key:
-            raise ValueError("ANTHROPIC_API_KEY environment variable not set")
-        self.client = Anthropic(api_key=api_key)
-
-    def parse_goal(
-        self,
-        goal: str,
-        email_count: int,
-        conversation_history: Optional[List[Tuple[str, str]]] = None,
-        query_info: Optional[Dict] = None
-    ) -> Tuple[List[Action], str]:
-        """
-        Parse a natural language goal into a sequence of RLM actions.
-
-        Args:
-            goal: Natural language goal from user
-            email_count: Number of emails to operate on
-            conversation_history: Previous conversation turns
-            query_info: Information about the email query (query string, labels, etc.)
-
-        Returns:
-            Tuple of (actions, reasoning) where actions is a list of Action objects
-            and reasoning explains the interpretation
-        """
-        prompt = self._build_goal_parsing_prompt(
-            goal, email_count, conversation_history, query_info
+    def __eq__(self, other):
+        if not isinstance(other, Action):
+            return NotImplemented
+        return (
+            self.function == other.function
+            and self.args == other.args
+            and self.description == other.description
         )
 
-        try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=4096,
-                messages=[{"role": "user", "content": prompt}]
-            )
-
-            # Extract text from response
-            response_text = response.content[0].text
-
-            # Parse JSON response
-            result = json.loads(response_text)
-
-            # Convert to Action objects
-            actions = [Action.from_dict(action_dict) for action_dict in result['actions']]
-            reasoning = result.get('reasoning', '')
-
-            return actions, reasoning
-
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse LLM response as JSON: {e}\nResponse: {response_text}")
-        except Exception as e:
-            raise ValueError(f"Failed to interpret goal: {e}")
-
-    def _build_goal_parsing_prompt(
-        self,
-        goal: str,
-        email_count: int,
-        conversation_history: Optional[List[Tuple[str, str]]],
-        query_info: Optional[Dict]
-    ) -> str:
-        """Build the prompt for goal parsing."""
+    def __hash__(self):
+        return hash((self.function, _freeze(self.args), self.description))
 
-        history_context = ""
-        if conversation_history:
-            history_context = "\n\nConversation History:\n"
-            for turn_goal, turn_response in conversation_history[-3:]:  # Last 3 turns
-                history_context += f"User: {turn_goal}\n"
-                history_context += f"Agent: {turn_response[:200]}...\n\n"
-
-        query_context = ""
-        if query_info:
-            query_context = f"\n\nEmail Query Info:\n{json.dumps(query_info, indent=2)}\n"
+    def __repr__(self):
+        return f"Action({self.function}, {self.args})"
 
-        prompt = f"""You are an email analysis assistant. The user has {email_count} emails and wants to accomplish the following goal:
 
-"{goal}"
-{history_context}{query_context}
-Your task is to determine the sequence of RLM (Recursive Language Model) functions to call to accomplish this goal.
+# Static part of the goal parsing prompt. Sent as a cached system block so
+# repeated parse_goal calls only pay full input cost for the dynamic part.
+_GOAL_PARSING_SYSTEM_PROMPT = """You are an email analysis assistant. Your task is to determine the sequence of RLM (Recursive Language Model) functions to call to accomplish the user's goal.
 
 Available RLM Functions:
 
@@ -155,16 +149,16 @@ DATA EXTRACTION:
 - detect_patterns(emails): Detect patterns in email content
 
 Return a JSON object with this structure:
-{{
+{
     "reasoning": "Brief explanation of why you chose these functions",
     "actions": [
-        {{
+        {
             "function": "function_name",
-            "args": {{"arg1": "value1", "arg2": "value2"}},
+            "args": {"arg1": "value1", "arg2": "value2"},
             "description": "What this step does"
-        }}
+        }
     ]
-}}
+}
 
 IMPORTANT GUIDELINES:
 1. If the goal is vague or could be interpreted multiple ways, choose the most likely interpretation based on context
@@ -180,56 +174,311 @@ IMPORTANT GUIDELINES:
 Examples:
 
 Goal: "Triage security alerts from last week"
-{{
+{
     "reasoning": "User wants comprehensive security analysis. security_triage provides P1-P5 classification, IOCs, kill chains, and executive summary.",
     "actions": [
-        {{
+        {
             "function": "security_triage",
-            "args": {{"emails": "emails"}},
+            "args": {"emails": "emails"},
             "description": "Complete security alert triage with classification, IOCs, and kill chain detection"
-        }}
+        }
     ]
-}}
+}
 
 Goal: "Summarize my inbox"
-{{
+{
     "reasoning": "User wants email categorization and summary. inbox_triage classifies into urgent/action/fyi/newsletter.",
     "actions": [
-        {{
+        {
             "function": "inbox_triage",
-            "args": {{"emails": "emails"}},
+            "args": {"emails": "emails"},
             "description": "Classify emails into categories for quick inbox overview"
-        }}
+        }
     ]
-}}
+}
 
 Goal: "Find action items"
-{{
+{
     "reasoning": "User wants to extract tasks with deadlines. find_action_items is the specific function for this.",
     "actions": [
-        {{
+        {
             "function": "find_action_items",
-            "args": {{"emails": "emails"}},
+            "args": {"emails": "emails"},
             "description": "Extract action items with deadlines and priority"
-        }}
+        }
     ]
-}}
+}
 
 Goal: "Show me P1 alerts"
-{{
+{
     "reasoning": "User previously ran triage and now wants to filter for P1. Need to run triage first if not in history.",
     "actions": [
-        {{
+        {
             "function": "security_triage",
-            "args": {{"emails": "emails"}},
+            "args": {"emails": "emails"},
             "description": "Run security triage to get P1 classifications"
-        }}
+        }
     ]
-}}
+}
+"""
 
+
+# Per-call part of the goal parsing prompt (user message)
+_GOAL_PROMPT_TEMPLATE = """The user has {email_count} emails and wants to accomplish the following goal:
+
+"{goal}"
+{context}
 Now interpret the user's goal and return the JSON action plan."""
 
-        return prompt
+_BATCH_PROMPT_TEMPLATE = """The user has {email_count} emails and wants to accomplish each of the following goals independently:
+
+{goal_list}
+{context}
+Now interpret each goal and return a JSON array with one action plan object per goal, in the same order."""
+
+_CORRECTION_TEMPLATE = """These functions are not available: {functions}. Use only the functions listed in the catalog and return the corrected JSON action plan."""
+
+# Parsed plans kept by GoalInterpreter for repeated goals
+_PLAN_CACHE_SIZE = 128
+
+# Goals per parse_goals_batch() API call, and max_tokens per goal; the total
+# stays under the SDK's limit for non-streaming requests (~21k tokens)
+_MAX_GOALS_PER_CALL = 4
+_MAX_TOKENS_PER_GOAL = 4096
+
+# estimate_cost(): base cost per action (LLM call overhead) and per-email
+# processing cost by function
+_BASE_ACTION_COST = 0.01
+_PER_EMAIL_COST = {
+    'security_triage': 0.005,  # Expensive due to multiple LLM calls
+    'detect_attack_chains': 0.004,
+    'phishing_analysis': 0.004,
+    'inbox_triage': 0.003,
+    'weekly_summary': 0.002,
+    'find_action_items': 0.002,
+    'parallel_map': 0.003,
+    'llm_query': 0.002,
+}
+
+
+class GoalInterpreter:
+    """Interprets natural language goals and generates RLM execution plans."""
+
+    def __init__(self, model: str = "claude-sonnet-4-20250514"):
+        self.model = model
+        api_key = os.environ.get('ANTHROPIC_API_KEY')
+        if not api_key:
+            raise ValueError("ANTHROPIC_API_KEY environment variable not set")
+        self.client = Anthropic(api_key=api_key)
+
+        # Parsed plans by (goal, email count, history tail, query info)
+        self._plan_cache: Dict[Tuple, Tuple[List[Action], str]] = {}
+
+    def invalidate(self):
+        """Drop cached plans so the next parse_goal() asks the LLM again."""
+        self._plan_cache.clear()
+
+    def _plan_key(
+        self,
+        goal: str,
+        email_count: int,
+        conversation_history: Optional[List[Tuple[str, str]]],
+        query_info: Optional[Dict]
+    ) -> Tuple:
+        """Cache key covering everything the goal parsing prompt depends on."""
+        # Same history slice and truncation as the prompt
+        history = tuple(
+            (turn_goal, turn_response[:200])
+            for turn_goal, turn_response in (conversation_history or [])[-3:]
+        )
+        query = json.dumps(query_info, sort_keys=True) if query_info else None
+        return (' '.join(goal.lower().split()), email_count, history, query)
+
+    def parse_goal(
+        self,
+        goal: str,
+        email_count: int,
+        conversation_history: Optional[List[Tuple[str, str]]] = None,
+        query_info: Optional[Dict] = None
+    ) -> Tuple[List[Action], str]:
+        """
+        Parse a natural language goal into a sequence of RLM actions.
+
+        Args:
+            goal: Natural language goal from user
+            email_count: Number of emails to operate on
+            conversation_history: Previous conversation turns
+            query_info: Information about the email query (query string, labels, etc.)
+
+        Returns:
+            Tuple of (actions, reasoning) where actions is a list of Action objects
+            and reasoning explains the interpretation
+        """
+        key = self._plan_key(goal, email_count, conversation_history, query_info)
+        cached = self._plan_cache.get(key)
+        if cached is not None:
+            actions, reasoning = cached
+            # Copies, so callers can't modify the cached plan
+            return copy.deepcopy(actions), reasoning
+
+        prompt = self._build_goal_parsing_prompt(
+            goal, email_count, conversation_history, query_info
+        )
+
+        messages = [{"role": "user", "content": prompt}]
+        response_text = ""
+        try:
+            for attempt in range(2):
+                response_text = self._request_plan(messages, max_tokens=4096)
+
+                # Parse JSON response
+                result = _loads(response_text)
+
+                # Convert to Action objects
+                actions = [Action.from_dict(action_dict) for action_dict in result['actions']]
+
+                # Reject unknown functions here rather than after an RLM run
+                unknown = _unknown_functions(actions)
+                if not unknown:
+                    break
+                if attempt:
+                    raise ValueError(f"Unknown functions: {unknown}")
+
+                # One corrective re-prompt before giving up
+                messages += [
+                    {"role": "assistant", "content": response_text},
+                    {"role": "user", "content": _CORRECTION_TEMPLATE.format(functions=", ".join(unknown))}
+                ]
+
+            reasoning = result.get('reasoning', '')
+
+            if len(self._plan_cache) >= _PLAN_CACHE_SIZE:
+                # Evict the oldest entry
+                del self._plan_cache[next(iter(self._plan_cache))]
+            self._plan_cache[key] = (copy.deepcopy(actions), reasoning)
+
+            return actions, reasoning
+
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse LLM response as JSON: {e}\nResponse: {response_text}")
+        except Exception as e:
+            raise ValueError(f"Failed to interpret goal: {e}")
+
+    def parse_goals_batch(
+        self,
+        goals: List[str],
+        email_count: int,
+        conversation_history: Optional[List[Tuple[str, str]]] = None,
+        query_info: Optional[Dict] = None
+    ) -> List[Tuple[List[Action], str]]:
+        """
+        Parse several independent goals, up to _MAX_GOALS_PER_CALL (4) per API call.
+
+        Queued goals (e.g. bulk triage runs) share one round trip and one
+        read of the system prompt instead of paying for each separately.
+
+        Args:
+            goals: Natural language goals from the user
+            email_count: Number of emails to operate on
+            conversation_history: Previous conversation turns
+            query_info: Information about the email query (query string, labels, etc.)
+
+        Returns:
+            List of (actions, reasoning) tuples, in the same order as goals
+        """
+        if len(goals) == 1:
+            return [self.parse_goal(goals[0], email_count, conversation_history, query_info)]
+
+        results = []
+        for start in range(0, len(goals), _MAX_GOALS_PER_CALL):
+            batch = goals[start:start + _MAX_GOALS_PER_CALL]
+            prompt = self._build_batch_prompt(
+                batch, email_count, conversation_history, query_info
+            )
+
+            response_text = ""
+            try:
+                response_text = self._request_plan(
+                    [{"role": "user", "content": prompt}], max_tokens=_MAX_TOKENS_PER_GOAL * len(batch)
+                )
+                plans = _loads(response_text)
+                if not isinstance(plans, list) or len(plans) != len(batch):
+                    raise ValueError(f"Expected a JSON array of {len(batch)} plans")
+
+                for plan in plans:
+                    actions = [Action.from_dict(action_dict) for action_dict in plan['actions']]
+                    unknown = _unknown_functions(actions)
+                    if unknown:
+                        raise ValueError(f"Unknown functions: {unknown}")
+                    results.append((actions, plan.get('reasoning', '')))
+
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Failed to parse LLM response as JSON: {e}\nResponse: {response_text}")
+            except Exception as e:
+                raise ValueError(f"Failed to interpret goals: {e}")
+
+        return results
+
+    def _request_plan(self, messages: List[Dict], max_tokens: int) -> str:
+        """Send goal parsing messages and return the response text."""
+        response = self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            system=[{
+                "type": "text",
+                "text": _GOAL_PARSING_SYSTEM_PROMPT,
+                "cache_control": {"type": "ephemeral"}
+            }],
+            messages=messages
+        )
+        return response.content[0].text
+
+    def _build_context(
+        self,
+        conversation_history: Optional[List[Tuple[str, str]]],
+        query_info: Optional[Dict]
+    ) -> str:
+        """Build the conversation history and query info sections of a prompt."""
+        history_context = ""
+        if conversation_history:
+            history_context = "\n\nConversation History:\n"
+            for turn_goal, turn_response in conversation_history[-3:]:  # Last 3 turns
+                history_context += f"User: {turn_goal}\n"
+                history_context += f"Agent: {turn_response[:200]}...\n\n"
+
+        query_context = ""
+        if query_info:
+            query_context = f"\n\nEmail Query Info:\n{json.dumps(query_info, indent=2)}\n"
+
+        return history_context + query_context
+
+    def _build_goal_parsing_prompt(
+        self,
+        goal: str,
+        email_count: int,
+        conversation_history: Optional[List[Tuple[str, str]]],
+        query_info: Optional[Dict]
+    ) -> str:
+        """Build the per-call part of the goal parsing prompt (goal, history, query)."""
+        return _GOAL_PROMPT_TEMPLATE.format(
+            email_count=email_count,
+            goal=goal,
+            context=self._build_context(conversation_history, query_info)
+        )
+
+    def _build_batch_prompt(
+        self,
+        goals: List[str],
+        email_count: int,
+        conversation_history: Optional[List[Tuple[str, str]]],
+        query_info: Optional[Dict]
+    ) -> str:
+        """Build the per-call prompt for several independent goals."""
+        return _BATCH_PROMPT_TEMPLATE.format(
+            email_count=email_count,
+            goal_list="\n".join(f'{i}. "{goal}"' for i, goal in enumerate(goals, 1)),
+            context=self._build_context(conversation_history, query_info)
+        )
 
     def estimate_cost(self, actions: List[Action], email_count: int) -> float:
         """
@@ -237,28 +486,10 @@ Now interpret the user's goal and return the JSON action plan."""
 
         This is a rough estimate based on typical token usage.
         """
-        # Base cost per action (LLM call overhead)
-        base_cost = 0.01
-
-        # Per-email processing cost
-        per_email_cost = {
-            'security_triage': 0.005,  # Expensive due to multiple LLM calls
-            'detect_attack_chains': 0.004,
-            'phishing_analysis': 0.004,
-            'inbox_triage': 0.003,
-            'weekly_summary': 0.002,
-            'find_action_items': 0.002,
-            'parallel_map': 0.003,
-            'llm_query': 0.002,
-        }
-
         total_cost = 0.0
         for action in actions:
-            # Base cost for the action
-            total_cost += base_cost
-
-            # Add per-email cost if applicable
-            func_cost = per_email_cost.get(action.function, 0.001)
-            total_cost += func_cost * email_count
+            # Base cost for the action, plus per-email cost if applicable
+            total_cost += _BASE_ACTION_COST
+            total_cost += _PER_EMAIL_COST.get(action.function, 0.001) * email_count
 
         return round(total_cost, 2)
@@ -5,21 +5,151 @@ Formats RLM execution results for user-friendly display.
 Supports text, JSON, and HTML output formats.
 """
 
+import io
 import json
-from typing import Dict, List, Optional, Any, Tuple
+from functools import lru_cache
+from html import escape as _html_escape
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ._json import dumps as _dumps
+
+try:
+    from markupsafe import escape as _markup_escape
+except ImportError:  # Optional speedup; stdlib html.escape is used otherwise
+    _markup_escape = None
+
+
+def _escape(value: Any) -> str:
+    """HTML-escape str(value)."""
+    if _markup_escape is not None:
+        return str(_markup_escape(value))
+    return _html_escape(str(value))
+
+
+# Placeholders for missing item fields in text output
+_NO_SUBJECT = 'No subject'
+_UNKNOWN_SENDER = 'Unknown sender'
+_UNKNOWN = 'Unknown'
+_UNKNOWN_PATTERN = 'Unknown pattern'
+_NO_DETAILS = 'No details'
+
+# Section separators (with line ending) for text output
+_SEP50 = "─" * 50 + "\n"
+_SEP30 = "─" * 30 + "\n"
+
+# (result key, section label) in display order
+_INBOX_CATEGORIES = (
+    ('urgent', 'URGENT'),
+    ('action_required', 'ACTION REQUIRED'),
+    ('fyi', 'FYI'),
+    ('newsletter', 'NEWSLETTERS')
+)
+
+_PHISHING_CATEGORIES = (
+    ('credential_harvesting', 'Credential Harvesting'),
+    ('bec_attempts', 'BEC Attempts'),
+    ('brand_impersonation', 'Brand Impersonation'),
+    ('malicious_attachments', 'Malicious Attachments'),
+    ('malicious_links', 'Malicious Links')
+)
+
+# (summary key, label) for security triage statistics
+_SUMMARY_FIELDS = (
+    ('total_alerts', 'Total Alerts'),
+    ('p1_critical', 'P1 Critical'),
+    ('p2_high', 'P2 High'),
+    ('p3_medium', 'P3 Medium'),
+    ('p4_low', 'P4 Low'),
+    ('p5_info', 'P5 Info')
+)
+_SUMMARY_KEYS = tuple(key for key, _ in _SUMMARY_FIELDS)
+# The whole statistics section as one format string
+_SUMMARY_TEMPLATE = (
+    "SUMMARY STATISTICS\n" + _SEP50
+    + "".join(f"{label}: {{}}\n" for _, label in _SUMMARY_FIELDS) + "\n"
+)
+
+# (IOC key, label) for indicator counts
+_IOC_TYPES = (
+    ('ips', 'IPs'),
+    ('domains', 'Domains'),
+    ('file_hashes', 'File Hashes'),
+    ('urls', 'URLs')
+)
+
+# Text writer for dict results, by trigger keys (first match wins)
+_TEXT_DISPATCH = (
+    (frozenset({'summary', 'classifications'}), '_write_security_triage'),
+    (frozenset({'urgent', 'action_required'}), '_write_inbox_triage'),
+    (frozenset({'attack_id'}), '_write_attack_chains'),
+    (frozenset({'credential_harvesting', 'bec_attempts'}), '_write_phishing_analysis')
+)
+
+# Document head, styles and page title for HTML output
+_HTML_HEADER = "\n".join([
+    "<html><head><style>",
+    "body { font-family: Arial, sans-serif; margin: 20px; }",
+    "h1 { color: #333; }",
+    "h2 { color: #666; margin-top: 20px; }",
+    ".stat { margin: 10px 0; }",
+    ".alert { padding: 10px; margin: 5px 0; border-left: 3px solid #f00; }",
+    "</style></head><body>",
+    "<h1>Gmail Agent Results</h1>"
+])
+
+
+@lru_cache(maxsize=128)
+def _suggestions_for(signature: Tuple) -> Tuple[str, ...]:
+    """Follow-up suggestions for a result signature (see suggest_follow_ups)."""
+    triage, has_urgent, has_action_required = signature
+    suggestions = []
+
+    # Security triage suggestions
+    if triage is not None:
+        has_p1, has_p2, has_kill_chains, has_iocs = triage
+        if has_p1:
+            suggestions.append("Show me P1 alert details")
+        if has_p2:
+            suggestions.append("Show me P2 alert details")
+        if has_kill_chains:
+            suggestions.append("What's the confidence on the kill chains?")
+        if has_iocs:
+            suggestions.append("Extract IOCs for threat intel")
+
+    # Inbox triage suggestions
+    if has_urgent:
+        suggestions.append("Show me urgent emails")
+    if has_action_required:
+        suggestions.append("Extract action items")
+
+    # Generic suggestions
+    if not suggestions:
+        suggestions.append("Provide more details")
+        suggestions.append("Summarize the key findings")
+
+    return tuple(suggestions[:4])  # Return max 4 suggestions
 
 
 class ResultFormatter:
     """Formats execution results for display."""
 
-    def __init__(self, format: str = 'text'):
+    def __init__(
+        self,
+        format: str = 'text',
+        pretty: bool = False,
+        max_items_per_category: int = 5
+    ):
         """
         Initialize formatter.
 
         Args:
             format: Output format ('text', 'json', 'html')
+            pretty: Indent JSON output (compact by default)
+            max_items_per_category: Emails listed per triage category in text output
         """
         self.format = format
+        self.pretty = pretty
+        self.max_items_per_category = max_items_per_category
 
     def format_result(
         self,
@@ -45,6 +175,36 @@ class ResultFormatter:
         else:
             return self._format_text(data, conversation_history, context)
 
+    def format_batch_summary(self, results: List[Dict]) -> str:
+        """
+        Summarize IOC counts across many security triage results.
+
+        Args:
+            results: Security triage result dicts
+
+        Returns:
+            Text summary of total indicators per type
+        """
+        totals = [0] * len(_IOC_TYPES)
+        with_iocs = 0
+        for data in results:
+            iocs = data.get('iocs')
+            if not iocs:
+                continue
+            with_iocs += 1
+            for i, (key, _) in enumerate(_IOC_TYPES):
+                values = iocs.get(key)
+                if values:
+                    totals[i] += len(values)
+
+        buf = io.StringIO()
+        buf.write("INDICATORS OF COMPROMISE (ALL RESULTS)\n")
+        buf.write(_SEP50)
+        buf.write(f"Results: {len(results)} ({with_iocs} with IOCs)\n")
+        for (_, label), total in zip(_IOC_TYPES, totals):
+            buf.write(f"{label}: {total}\n")
+        return buf.getvalue()[:-1]
+
     def _format_text(
         self,
         data: Any,
@@ -52,217 +212,188 @@ class ResultFormatter:
         context: Optional[Dict]
     ) -> str:
         """Format result as human-readable text."""
-        lines = []
+        # Simple value with nothing to append
+        if not context and not isinstance(data, (dict, list)):
+            return str(data)
+
+        buf = io.StringIO()
 
         # Detect result type and format accordingly
         if isinstance(data, dict):
             # Check for common result structures
-            if 'summary' in data or 'classifications' in data:
-                # Security triage result
-                lines.extend(self._format_security_triage(data))
-            elif 'urgent' in data or 'action_required' in data:
-                # Inbox triage result
-                lines.extend(self._format_inbox_triage(data))
-            elif 'attack_id' in data or (isinstance(data, list) and data and 'attack_id' in data[0]):
-                # Attack chains result
-                lines.extend(self._format_attack_chains(data))
-            elif 'credential_harvesting' in data or 'bec_attempts' in data:
-                # Phishing analysis result
-                lines.extend(self._format_phishing_analysis(data))
+            keys = data.keys()
+            for trigger, writer in _TEXT_DISPATCH:
+                if keys & trigger:
+                    getattr(self, writer)(buf, data)
+                    break
             else:
                 # Generic dict result
-                lines.extend(self._format_generic_dict(data))
+                self._write_generic_dict(buf, data)
         elif isinstance(data, list):
-            # List of items
-            lines.extend(self._format_list(data))
+            if data and isinstance(data[0], dict) and 'attack_id' in data[0]:
+                # List of attack chains
+                self._write_attack_chains(buf, data)
+            else:
+                # List of items
+                self._write_list(buf, data)
         else:
             # Simple value
-            lines.append(str(data))
+            buf.write(f"{data}\n")
 
         # Add context information if available
         if context:
-            lines.append("")
-            lines.append("─" * 50)
+            buf.write("\n")
+            buf.write(_SEP50)
             if 'cost' in context:
-                lines.append(f"Cost: ${context['cost']:.4f}")
+                buf.write(f"Cost: ${context['cost']:.4f}\n")
             if 'execution_time' in context:
-                lines.append(f"Execution time: {context['execution_time']:.2f}s")
+                buf.write(f"Execution time: {context['execution_time']:.2f}s\n")
 
-        return "\n".join(lines)
+        # Every line is newline-terminated; drop the final one
+        return buf.getvalue()[:-1]
 
-    def _format_security_triage(self, data: Dict) -> List[str]:
-        """Format security triage results."""
-        lines = []
+    def _write_security_triage(self, buf: io.StringIO, data: Dict):
+        """Write security triage results."""
+        write = buf.write
 
         # Executive summary
         if 'executive_summary' in data:
-            lines.append("EXECUTIVE SUMMARY")
-            lines.append("─" * 50)
-            lines.append(data['executive_summary'])
-            lines.append("")
+            write("EXECUTIVE SUMMARY\n")
+            write(_SEP50)
+            write(f"{data['executive_summary']}\n\n")
 
         # Summary statistics
         if 'summary' in data:
-            summary = data['summary']
-            lines.append("SUMMARY STATISTICS")
-            lines.append("─" * 50)
-            lines.append(f"Total Alerts: {summary.get('total_alerts', 0)}")
-            lines.append(f"P1 Critical: {summary.get('p1_critical', 0)}")
-            lines.append(f"P2 High: {summary.get('p2_high', 0)}")
-            lines.append(f"P3 Medium: {summary.get('p3_medium', 0)}")
-            lines.append(f"P4 Low: {summary.get('p4_low', 0)}")
-            lines.append(f"P5 Info: {summary.get('p5_info', 0)}")
-            lines.append("")
+            get = data['summary'].get
+            write(_SUMMARY_TEMPLATE.format(*[get(key, 0) for key in _SUMMARY_KEYS]))
 
         # Classifications
         if 'classifications' in data:
             classifications = data['classifications']
-            if classifications.get('P1'):
-                lines.append("P1 CRITICAL ALERTS")
-                lines.append("─" * 50)
-                for alert in classifications['P1'][:5]:  # Show first 5
-                    lines.append(f"• {alert.get('subject', 'No subject')}")
+            alerts = classifications.get('P1')
+            if alerts:
+                write("P1 CRITICAL ALERTS\n")
+                write(_SEP50)
+                shown = self.max_items_per_category
+                for alert in alerts[:shown]:
+                    get = alert.get
+                    write(f"• {get('subject', _NO_SUBJECT)}\n")
                     if 'reasoning' in alert:
-                        lines.append(f"  Reason: {alert['reasoning']}")
-                if len(classifications['P1']) > 5:
-                    lines.append(f"  ... and {len(classifications['P1']) - 5} more")
-                lines.append("")
+                        write(f"  Reason: {alert['reasoning']}\n")
+                remainder = len(alerts) - shown
+                if remainder > 0:
+                    write(f"  ... and {remainder} more\n")
+                write("\n")
 
         # Kill chains
         if 'kill_chains' in data and data['kill_chains']:
-            lines.append("DETECTED ATTACK CHAINS")
-            lines.append("─" * 50)
+            write("DETECTED ATTACK CHAINS\n")
+            write(_SEP50)
             for i, chain in enumerate(data['kill_chains'][:3]):  # Show first 3
-                lines.append(f"Chain {i + 1}: {chain.get('pattern', 'Unknown pattern')}")
-                lines.append(f"  Confidence: {chain.get('confidence', 0):.0%}")
+                get = chain.get
+                write(f"Chain {i + 1}: {get('pattern', _UNKNOWN_PATTERN)}\n")
+                write(f"  Confidence: {get('confidence', 0):.0%}\n")
                 if 'mitre_techniques' in chain:
-                    lines.append(f"  MITRE: {', '.join(chain['mitre_techniques'])}")
+                    write(f"  MITRE: {', '.join(chain['mitre_techniques'])}\n")
             if len(data['kill_chains']) > 3:
-                lines.append(f"  ... and {len(data['kill_chains']) - 3} more")
-            lines.append("")
+                write(f"  ... and {len(data['kill_chains']) - 3} more\n")
+            write("\n")
 
         # IOCs
         if 'iocs' in data:
             iocs = data['iocs']
-            lines.append("INDICATORS OF COMPROMISE")
-            lines.append("─" * 50)
-            lines.append(f"IPs: {len(iocs.get('ips', []))}")
-            lines.append(f"Domains: {len(iocs.get('domains', []))}")
-            lines.append(f"File Hashes: {len(iocs.get('file_hashes', []))}")
-            lines.append(f"URLs: {len(iocs.get('urls', []))}")
-            lines.append("")
-
-        return lines
-
-    def _format_inbox_triage(self, data: Dict) -> List[str]:
-        """Format inbox triage results."""
-        lines = []
-
-        lines.append("INBOX TRIAGE")
-        lines.append("─" * 50)
-
-        categories = [
-            ('urgent', 'URGENT'),
-            ('action_required', 'ACTION REQUIRED'),
-            ('fyi', 'FYI'),
-            ('newsletter', 'NEWSLETTERS')
-        ]
-
-        for key, label in categories:
+            write("INDICATORS OF COMPROMISE\n")
+            write(_SEP50)
+            for key, label in _IOC_TYPES:
+                values = iocs.get(key)
+                write(f"{label}: {len(values) if values else 0}\n")
+            write("\n")
+
+    def _write_inbox_triage(self, buf: io.StringIO, data: Dict):
+        """Write inbox triage results."""
+        write = buf.write
+
+        write("INBOX TRIAGE\n")
+        write(_SEP50)
+
+        shown = self.max_items_per_category
+        for key, label in _INBOX_CATEGORIES:
             if key in data:
                 items = data[key]
-                lines.append(f"\n{label} ({len(items)} emails)")
-                lines.append("─" * 30)
-                for email in items[:5]:  # Show first 5
-                    subject = email.get('subject', 'No subject')
-                    sender = email.get('from', 'Unknown sender')
-                    lines.append(f"• {subject}")
-                    lines.append(f"  From: {sender}")
-                if len(items) > 5:
-                    lines.append(f"  ... and {len(items) - 5} more")
-
-        return lines
-
-    def _format_attack_chains(self, data: Any) -> List[str]:
-        """Format attack chain detection results."""
-        lines = []
+                n = len(items)
+                write(f"\n{label} ({n} emails)\n")
+                write(_SEP30)
+                for email in items[:shown]:
+                    get = email.get
+                    write(f"• {get('subject', _NO_SUBJECT)}\n")
+                    write(f"  From: {get('from', _UNKNOWN_SENDER)}\n")
+                if n > shown:
+                    write(f"  ... and {n - shown} more\n")
+
+    def _write_attack_chains(self, buf: io.StringIO, data: Any):
+        """Write attack chain detection results."""
+        write = buf.write
 
         chains = data if isinstance(data, list) else [data]
 
-        lines.append("ATTACK CHAIN DETECTION")
-        lines.append("─" * 50)
-        lines.append(f"Total Chains Detected: {len(chains)}")
-        lines.append("")
+        write("ATTACK CHAIN DETECTION\n")
+        write(_SEP50)
+        write(f"Total Chains Detected: {len(chains)}\n\n")
 
         for i, chain in enumerate(chains):
-            lines.append(f"Chain {i + 1}: {chain.get('attack_id', 'Unknown')}")
-            lines.append(f"  Pattern: {chain.get('pattern', 'Unknown')}")
-            lines.append(f"  Severity: {chain.get('severity', 'Unknown')}")
-            lines.append(f"  Confidence: {chain.get('confidence', 0):.0%}")
+            get = chain.get
+            write(f"Chain {i + 1}: {get('attack_id', _UNKNOWN)}\n")
+            write(f"  Pattern: {get('pattern', _UNKNOWN)}\n")
+            write(f"  Severity: {get('severity', _UNKNOWN)}\n")
+            write(f"  Confidence: {get('confidence', 0):.0%}\n")
             if 'mitre_techniques' in chain:
-                lines.append(f"  MITRE: {', '.join(chain['mitre_techniques'])}")
+                write(f"  MITRE: {', '.join(chain['mitre_techniques'])}\n")
             if 'start_time' in chain:
-                lines.append(f"  Start Time: {chain['start_time']}")
-            lines.append("")
-
-        return lines
+                write(f"  Start Time: {chain['start_time']}\n")
+            write("\n")
 
-    def _format_phishing_analysis(self, data: Dict) -> List[str]:
-        """Format phishing analysis results."""
-        lines = []
+    def _write_phishing_analysis(self, buf: io.StringIO, data: Dict):
+        """Write phishing analysis results."""
+        write = buf.write
 
-        lines.append("PHISHING ANALYSIS")
-        lines.append("─" * 50)
+        write("PHISHING ANALYSIS\n")
+        write(_SEP50)
 
         if 'summary' in data:
-            lines.append(data['summary'])
-            lines.append("")
-
-        categories = [
-            ('credential_harvesting', 'Credential Harvesting'),
-            ('bec_attempts', 'BEC Attempts'),
-            ('brand_impersonation', 'Brand Impersonation'),
-            ('malicious_attachments', 'Malicious Attachments'),
-            ('malicious_links', 'Malicious Links')
-        ]
-
-        for key, label in categories:
+            write(f"{data['summary']}\n\n")
+
+        for key, label in _PHISHING_CATEGORIES:
             if key in data and data[key]:
                 items = data[key]
-                lines.append(f"\n{label} ({len(items)})")
-                lines.append("─" * 30)
+                n = len(items)
+                write(f"\n{label} ({n})\n")
+                write(_SEP30)
                 for item in items[:3]:  # Show first 3
-                    lines.append(f"• {item.get('subject', item.get('description', 'No details'))}")
-                if len(items) > 3:
-                    lines.append(f"  ... and {len(items) - 3} more")
-
-        return lines
+                    detail = item['subject'] if 'subject' in item else item.get('description', _NO_DETAILS)
+                    write(f"• {detail}\n")
+                if n > 3:
+                    write(f"  ... and {n - 3} more\n")
 
-    def _format_generic_dict(self, data: Dict) -> List[str]:
-        """Format a generic dictionary result."""
-        lines = []
+    def _write_generic_dict(self, buf: io.StringIO, data: Dict):
+        """Write a generic dictionary result."""
         for key, value in data.items():
             if isinstance(value, (list, dict)):
-                lines.append(f"{key}: {json.dumps(value, indent=2)}")
+                buf.write(f"{key}: {json.dumps(value, indent=2)}\n")
             else:
-                lines.append(f"{key}: {value}")
-        return lines
+                buf.write(f"{key}: {value}\n")
 
-    def _format_list(self, data: List) -> List[str]:
-        """Format a list result."""
-        lines = []
+    def _write_list(self, buf: io.StringIO, data: List):
+        """Write a list result."""
         for i, item in enumerate(data[:10]):  # Show first 10
             if isinstance(item, dict):
                 # Try to find a meaningful field to display
                 display = item.get('subject') or item.get('title') or item.get('description') or str(item)
-                lines.append(f"{i + 1}. {display}")
+                buf.write(f"{i + 1}. {display}\n")
             else:
-                lines.append(f"{i + 1}. {item}")
+                buf.write(f"{i + 1}. {item}\n")
 
         if len(data) > 10:
-            lines.append(f"... and {len(data) - 10} more items")
-
-        return lines
+            buf.write(f"... and {len(data) - 10} more items\n")
 
     def _format_json(self, data: Any, context: Optional[Dict]) -> str:
         """Format result as JSON."""
@@ -270,49 +401,117 @@ class ResultFormatter:
             'result': data,
             'context': context or {}
         }
-        return json.dumps(output, indent=2)
+        return _dumps(output, pretty=self.pretty).decode('utf-8')
 
     def _format_html(self, data: Any, context: Optional[Dict]) -> str:
         """Format result as HTML."""
+        buf = io.StringIO()
+        self.format_html_to(buf, data, context)
+        return buf.getvalue()
+
+    def format_html_to(self, out: Any, data: Any, context: Optional[Dict] = None):
+        """
+        Write a result as HTML to a text stream, without building the page in memory.
+
+        Args:
+            out: File-like object with a write() method
+            data: Result data from RLM execution
+            context: Additional context (cost, execution time, etc.)
+        """
+        write = out.write
         # Simple HTML formatting
-        html_parts = []
-        html_parts.append("<html><head><style>")
-        html_parts.append("body { font-family: Arial, sans-serif; margin: 20px; }")
-        html_parts.append("h1 { color: #333; }")
-        html_parts.append("h2 { color: #666; margin-top: 20px; }")
-        html_parts.append(".stat { margin: 10px 0; }")
-        html_parts.append(".alert { padding: 10px; margin: 5px 0; border-left: 3px solid #f00; }")
-        html_parts.append("</style></head><body>")
-
-        html_parts.append("<h1>Gmail Agent Results</h1>")
-
-        # Convert data to HTML
+        write(_HTML_HEADER)
+
+        # Convert data to HTML (memo shared so repeated sub-structures
+        # are rendered once)
+        memo: Dict[int, Optional[str]] = {}
         if isinstance(data, dict):
             for key, value in data.items():
-                html_parts.append(f"<h2>{key}</h2>")
-                html_parts.append(f"<div>{self._value_to_html(value)}</div>")
+                write(f"\n<h2>{_escape(key)}</h2>\n<div>")
+                self._write_value_html(write, value, memo)
+                write("</div>")
         else:
-            html_parts.append(f"<div>{self._value_to_html(data)}</div>")
+            write("\n<div>")
+            self._write_value_html(write, data, memo)
+            write("</div>")
 
         # Add context
         if context:
-            html_parts.append("<h2>Execution Details</h2>")
+            write("\n<h2>Execution Details</h2>")
             for key, value in context.items():
-                html_parts.append(f'<div class="stat"><strong>{key}:</strong> {value}</div>')
+                write(f'\n<div class="stat"><strong>{_escape(key)}:</strong> {_escape(value)}</div>')
+
+        write("\n</body></html>")
 
-        html_parts.append("</body></html>")
-        return "\n".join(html_parts)
+    def _write_value_html(
+        self,
+        write: Callable[[str], Any],
+        value: Any,
+        memo: Dict[int, Optional[str]]
+    ):
+        """
+        Write a value as HTML.
 
-    def _value_to_html(self, value: Any) -> str:
-        """Convert a value to HTML."""
+        Args:
+            write: Output stream's write method
+            value: Value to convert
+            memo: ids of dicts/lists already written, mapped to their HTML
+                once they are seen a second time (None until then)
+        """
+        if not isinstance(value, (dict, list)):
+            write(_escape(value))
+            return
+
+        key = id(value)
+        if key in memo:
+            html = memo[key]
+            if html is None:
+                html = memo[key] = self._value_to_html(value)
+            write(html)
+            return
+        memo[key] = None
+
+        write("<ul>")
         if isinstance(value, dict):
-            items = [f"<li><strong>{k}:</strong> {self._value_to_html(v)}</li>" for k, v in value.items()]
-            return f"<ul>{''.join(items)}</ul>"
-        elif isinstance(value, list):
-            items = [f"<li>{self._value_to_html(item)}</li>" for item in value]
-            return f"<ul>{''.join(items)}</ul>"
+            for k, v in value.items():
+                write(f"<li><strong>{_escape(k)}:</strong> ")
+                self._write_value_html(write, v, memo)
+                write("</li>")
         else:
-            return str(value)
+            for item in value:
+                write("<li>")
+                self._write_value_html(write, item, memo)
+                write("</li>")
+        write("</ul>")
+
+    def _value_to_html(self, value: Any, memo: Optional[Dict[int, str]] = None) -> str:
+        """
+        Convert a value to HTML.
+
+        Args:
+            value: Value to convert
+            memo: Rendered dicts/lists by id(), for objects referenced more
+                than once within one result
+
+        Returns:
+            HTML fragment
+        """
+        if not isinstance(value, (dict, list)):
+            return _escape(value)
+
+        if memo is None:
+            memo = {}
+        html = memo.get(id(value))
+        if html is not None:
+            return html
+
+        if isinstance(value, dict):
+            items = [f"<li><strong>{_escape(k)}:</strong> {self._value_to_html(v, memo)}</li>" for k, v in value.items()]
+        else:
+            items = [f"<li>{self._value_to_html(item, memo)}</li>" for item in value]
+        html = f"<ul>{''.join(items)}</ul>"
+        memo[id(value)] = html
+        return html
 
     def suggest_follow_ups(self, data: Any, goal: str) -> List[str]:
         """
@@ -325,29 +524,21 @@ class ResultFormatter:
         Returns:
             List of suggested follow-up questions
         """
-        suggestions = []
-
+        # The suggestions depend only on which parts of the result are
+        # present, so they are cached by that signature
         if isinstance(data, dict):
-            # Security triage suggestions
-            if 'classifications' in data:
-                if data['classifications'].get('P1'):
-                    suggestions.append("Show me P1 alert details")
-                if data['classifications'].get('P2'):
-                    suggestions.append("Show me P2 alert details")
-                if 'kill_chains' in data and data['kill_chains']:
-                    suggestions.append("What's the confidence on the kill chains?")
-                if 'iocs' in data:
-                    suggestions.append("Extract IOCs for threat intel")
-
-            # Inbox triage suggestions
-            if 'urgent' in data:
-                suggestions.append("Show me urgent emails")
-            if 'action_required' in data:
-                suggestions.append("Extract action items")
-
-        # Generic suggestions
-        if not suggestions:
-            suggestions.append("Provide more details")
-            suggestions.append("Summarize the key findings")
-
-        return suggestions[:4]  # Return max 4 suggestions
+            classifications = data.get('classifications')
+            if classifications is not None:
+                triage = (
+                    bool(classifications.get('P1')),
+                    bool(classifications.get('P2')),
+                    bool(data.get('kill_chains')),
+                    'iocs' in data
+                )
+            else:
+                triage = None
+            signature = (triage, 'urgent' in data, 'action_required' in data)
+        else:
+            signature = (None, False, False)
+
+        return list(_suggestions_for(signature))
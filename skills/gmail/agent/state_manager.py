@@ -3,31 +3,87 @@ State Manager for Gmail Agent
 
 Handles session persistence, conversation history, and budget tracking.
 Sessions are saved to ~/.gmail_agent_sessions/ for resumption.
+
+Each session is stored as two files:
+- <session_id>.json: session metadata and budget counters (rewritten per save)
+- <session_id>.jsonl: conversation turns, one JSON object per line (append-only)
 """
 
 import json
+import mmap
 import os
+import secrets
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from operator import attrgetter
+from typing import Dict, List, NamedTuple, Optional, Tuple, Any
+
+from ._json import HAVE_ORJSON, dumps as _dumps, dumps_line as _dumps_line, loads as _loads
+
+# Turn logs larger than this are memory-mapped when loaded
+_MMAP_THRESHOLD = 64 * 1024
+
+
+def _parse_turns(data: Any, turns: int) -> Tuple[List[str], List[str], int]:
+    """
+    Parse up to `turns` newline-terminated turn records from data
+    (bytes or mmap).
+
+    Returns:
+        Tuple of (goals, responses, offset just past the last record parsed)
+    """
+    goals, responses = [], []
+    # orjson parses memoryview slices in place; stdlib json needs bytes
+    view = memoryview(data) if HAVE_ORJSON else data
+    pos = 0
+    try:
+        while len(goals) < turns:
+            end = data.find(b"\n", pos)
+            if end < 0:
+                break
+            turn = _loads(view[pos:end])
+            goals.append(turn['goal'])
+            responses.append(turn['response'])
+            pos = end + 1
+    finally:
+        if view is not data:
+            view.release()
+    return goals, responses, pos
 
 
 class SessionState:
     """Represents a conversation session with the agent."""
 
+    __slots__ = (
+        'session_id', '_goals', '_responses', 'budget_limit', 'budget_used',
+        'budget_remaining', 'created_at', 'updated_at', 'metadata',
+        '_persisted_turns'
+    )
+
     def __init__(self, session_id: str, budget: float = 1.0):
         self.session_id = session_id
-        self.history: List[Tuple[str, str]] = []  # [(goal, response), ...]
+        # Turn i is (_goals[i], _responses[i])
+        self._goals: List[str] = []
+        self._responses: List[str] = []
         self.budget_limit = budget
         self.budget_used = 0.0
         self.budget_remaining = budget
         self.created_at = datetime.now().isoformat()
         self.updated_at = self.created_at
         self.metadata: Dict[str, Any] = {}
+        # Number of history turns already written to the turn log
+        self._persisted_turns = 0
+
+    @property
+    def history(self) -> List[Tuple[str, str]]:
+        """Conversation turns as [(goal, response), ...]."""
+        return list(zip(self._goals, self._responses))
 
     def add_turn(self, goal: str, response: str, cost: float = 0.0):
         """Add a conversation turn and update budget."""
-        self.history.append((goal, response))
+        self._goals.append(goal)
+        self._responses.append(response)
         self.budget_used += cost
         self.budget_remaining = self.budget_limit - self.budget_used
         self.updated_at = datetime.now().isoformat()
@@ -35,8 +91,10 @@ class SessionState:
     def to_dict(self) -> Dict:
         """Convert session to dictionary for JSON serialization."""
         return {
+            'schema': 2,
             'session_id': self.session_id,
-            'history': self.history,
+            'goals': self._goals,
+            'responses': self._responses,
             'budget_limit': self.budget_limit,
             'budget_used': self.budget_used,
             'budget_remaining': self.budget_remaining,
@@ -47,9 +105,16 @@ class SessionState:
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'SessionState':
-        """Create session from dictionary."""
+        """Create session from dictionary (either schema)."""
         session = cls(data['session_id'], data['budget_limit'])
-        session.history = [tuple(turn) for turn in data['history']]
+        if 'history' in data:
+            # Schema 1: list of [goal, response] pairs
+            for goal, response in data['history']:
+                session._goals.append(goal)
+                session._responses.append(response)
+        else:
+            session._goals = list(data['goals'])
+            session._responses = list(data['responses'])
         session.budget_used = data['budget_used']
         session.budget_remaining = data['budget_remaining']
         session.created_at = data['created_at']
@@ -58,6 +123,16 @@ class SessionState:
         return session
 
 
+class SessionSummary(NamedTuple):
+    """Summary row for a stored session (see StateManager.list_sessions)."""
+    session_id: str
+    created_at: str
+    updated_at: str
+    turns: int
+    budget_used: float
+    budget_remaining: float
+
+
 class StateManager:
     """Manages session storage and retrieval."""
 
@@ -70,21 +145,56 @@ class StateManager:
         # Create sessions directory if it doesn't exist
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
 
+        # list_sessions() summaries by file, with the mtime they were read at
+        # (None for unreadable files)
+        self._list_cache: Dict[Path, Tuple[int, Optional[SessionSummary]]] = {}
+
     def create_session_id(self) -> str:
         """Generate a unique session ID."""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        return f"session_{timestamp}"
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+        # Random suffix so sessions started in the same second (even from
+        # separate processes) get distinct IDs
+        return f"session_{timestamp}_{secrets.token_hex(4)}"
 
     def create_session(self, budget: float = 1.0) -> SessionState:
         """Create a new session."""
         session_id = self.create_session_id()
         return SessionState(session_id, budget)
 
-    def save_session(self, session: SessionState) -> Path:
-        """Save session to disk."""
+    def save_session(self, session: SessionState, pretty: bool = False) -> Path:
+        """
+        Save session to disk.
+
+        Appends turns added since the last save to the turn log and
+        atomically rewrites the small metadata file, so the cost of a save
+        does not grow with the length of the conversation.
+
+        Args:
+            session: Session to save
+            pretty: Indent the metadata file (compact by default)
+        """
         session_file = self.sessions_dir / f"{session.session_id}.json"
-        with open(session_file, 'w') as f:
-            json.dump(session.to_dict(), f, indent=2)
+        turns_file = self._turns_path(session.session_id)
+
+        start = session._persisted_turns
+        turns = len(session._goals)
+        if turns > start:
+            with open(turns_file, 'ab') as f:
+                f.write(b"".join(
+                    _dumps_line({'goal': goal, 'response': response})
+                    for goal, response in zip(
+                        session._goals[start:], session._responses[start:]
+                    )
+                ))
+            session._persisted_turns = turns
+
+        data = session.to_dict()
+        del data['goals'], data['responses']
+        data['turns'] = turns
+
+        tmp_file = self.sessions_dir / f".{session.session_id}.json.tmp"
+        tmp_file.write_bytes(_dumps(data, pretty=pretty))
+        os.replace(tmp_file, session_file)
         return session_file
 
     def load_session(self, session_id: str) -> Optional[SessionState]:
@@ -95,40 +205,102 @@ class StateManager:
             return None
 
         try:
-            with open(session_file, 'r') as f:
-                data = json.load(f)
-            return SessionState.from_dict(data)
-        except (json.JSONDecodeError, KeyError) as e:
+            data = _loads(session_file.read_bytes())
+
+            if 'history' in data:
+                # Legacy single-file session; history is moved to the turn
+                # log on the next save
+                session = SessionState.from_dict(data)
+            else:
+                data['goals'], data['responses'] = self._read_turns(
+                    session_id, data['turns']
+                )
+                session = SessionState.from_dict(data)
+                session._persisted_turns = len(session._goals)
+            return session
+        except (json.JSONDecodeError, KeyError, ValueError) as e:
             print(f"Error loading session {session_id}: {e}")
             return None
 
-    def list_sessions(self) -> List[Dict]:
-        """List all available sessions."""
-        sessions = []
+    def _turns_path(self, session_id: str) -> Path:
+        """Get the turn log path for a session."""
+        return self.sessions_dir / f"{session_id}.jsonl"
+
+    def _read_turns(self, session_id: str, turns: int) -> Tuple[List[str], List[str]]:
+        """
+        Read the first `turns` entries of a session's turn log as
+        (goals, responses).
+
+        Lines past the count recorded in the metadata file (left by an
+        interrupted save) are dropped from the log. Large logs are
+        memory-mapped rather than read into a bytes copy when orjson is
+        available.
+        """
+        turns_file = self._turns_path(session_id)
+        if not turns_file.exists():
+            return [], []
+
+        with open(turns_file, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if HAVE_ORJSON and size > _MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    goals, responses, end = _parse_turns(mm, turns)
+            else:
+                goals, responses, end = _parse_turns(f.read(), turns)
+
+        if end < size:
+            os.truncate(turns_file, end)
+        return goals, responses
+
+    def list_sessions(self) -> List[SessionSummary]:
+        """
+        List all available sessions.
+
+        Only files modified since the previous call are parsed again.
+        """
+        cache = {}
         for session_file in self.sessions_dir.glob('session_*.json'):
             try:
-                with open(session_file, 'r') as f:
-                    data = json.load(f)
-                sessions.append({
-                    'session_id': data['session_id'],
-                    'created_at': data['created_at'],
-                    'updated_at': data['updated_at'],
-                    'turns': len(data['history']),
-                    'budget_used': data['budget_used'],
-                    'budget_remaining': data['budget_remaining']
-                })
-            except (json.JSONDecodeError, KeyError):
+                mtime = session_file.stat().st_mtime_ns
+            except FileNotFoundError:
                 continue
 
+            cached = self._list_cache.get(session_file)
+            if cached is not None and cached[0] == mtime:
+                cache[session_file] = cached
+            else:
+                cache[session_file] = (mtime, self._read_summary(session_file))
+
+        # Entries for deleted files are dropped here
+        self._list_cache = cache
+
+        sessions = [summary for _, summary in cache.values() if summary is not None]
+
         # Sort by most recently updated
-        sessions.sort(key=lambda x: x['updated_at'], reverse=True)
+        sessions.sort(key=attrgetter('updated_at'), reverse=True)
         return sessions
 
+    def _read_summary(self, session_file: Path) -> Optional[SessionSummary]:
+        """Read a session's summary from its metadata file (None if unreadable)."""
+        try:
+            data = _loads(session_file.read_bytes())
+            return SessionSummary(
+                session_id=data['session_id'],
+                created_at=data['created_at'],
+                updated_at=data['updated_at'],
+                turns=data['turns'] if 'turns' in data else len(data['history']),
+                budget_used=data['budget_used'],
+                budget_remaining=data['budget_remaining']
+            )
+        except (OSError, json.JSONDecodeError, KeyError):
+            return None
+
     def delete_session(self, session_id: str) -> bool:
         """Delete a session."""
         session_file = self.sessions_dir / f"{session_id}.json"
         if session_file.exists():
             session_file.unlink()
+            self._turns_path(session_id).unlink(missing_ok=True)
             return True
         return False
 
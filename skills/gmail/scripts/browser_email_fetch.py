@@ -23,44 +23,75 @@ Usage:
 """
 
 import argparse
+import hashlib
 import json
-import subprocess
 import sys
 import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 
+from gmail_json import dumps as _dumps
 
+# Date shapes accepted by normalize_date()
+_RFC2822_RE = re.compile(r'\w+, \d+ \w+ \d{4} \d{2}:\d{2}:\d{2}')
+# YYYY-MM-DD HH:MM:SS or YYYY-MM-DDTHH:MM:SS
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})(?:\s+|T)(\d{1,2}):(\d{1,2}):(\d{1,2})')
+# MM/DD/YYYY HH:MM or DD/MM/YYYY HH:MM
+_SLASH_DATE_RE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})\s+(\d{1,2}):(\d{1,2})')
+
+# Snippet is the first _SNIPPET_LENGTH chars of the body, plus an ellipsis if cut
+_SNIPPET_LENGTH = 200
+_SNIPPET_ELLIPSIS = "..."
+
+# Gmail extractors by (browser session name, use_playwright, store_bodies,
+# verbose)
+# (see _get_extractor)
+_EXTRACTORS: dict = {}
+
+
+@lru_cache(maxsize=1)
 def check_agent_browser_installed() -> bool:
-    """Check if agent-browser is installed and accessible."""
-    try:
-        result = subprocess.run(
-            ["agent-browser", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        return result.returncode == 0
-    except (FileNotFoundError, subprocess.TimeoutExpired):
-        return False
+    """
+    Check if agent-browser is installed and on PATH.
+
+    Looks the executable up instead of running it; the result is cached
+    for the life of the process.
+    """
+    # Imported here: only real (non-mock) fetches need it
+    import shutil
+    return shutil.which("agent-browser") is not None
 
 
-def generate_email_id(index: int, url: str) -> str:
+@lru_cache(maxsize=16)
+def _detect_provider(url: str) -> Tuple[str, str, str]:
     """
-    Generate unique email ID for browser-fetched emails.
+    Identify the webmail provider from its URL.
 
-    Format: browser_email_{provider}_{index}
+    Returns:
+        Tuple of (short name for IDs, display name, mock sender domain)
     """
     if "gmail.com" in url:
-        provider = "gmail"
+        return "gmail", "Corporate Gmail", "company.com"
     elif "outlook.office365.com" in url:
-        provider = "o365"
+        return "o365", "Outlook 365", "company.com"
     elif "outlook.office.com" in url or "outlook.com" in url:
-        provider = "exchange"
+        return "exchange", "Exchange Online", "company.com"
     else:
-        provider = "webmail"
+        return "webmail", "Webmail", "example.com"
+
+
+def generate_email_id(index: int, provider: str) -> str:
+    """
+    Generate unique email ID for browser-fetched emails.
+
+    Format: browser_email_{provider}_{index}
 
+    Args:
+        index: 1-based position of the email
+        provider: Short provider name from _detect_provider()
+    """
     return f"browser_email_{provider}_{index:06d}"
 
 
@@ -68,11 +99,15 @@ def generate_thread_id(index: int, subject: str) -> str:
     """
     Generate thread ID based on subject.
 
-    In POC, we use a simple hash of the subject. In production,
+    In POC, we use a hash of the subject. In production,
     this would use email References headers for true threading.
+    The hash is deterministic (unlike hash(), which is salted per
+    process), so thread IDs are stable across runs.
     """
-    subject_hash = hash(subject.lower().strip()) & 0x7FFFFFFF
-    return f"browser_thread_{subject_hash:08x}"
+    subject_hash = hashlib.blake2b(
+        subject.lower().strip().encode("utf-8"), digest_size=4
+    ).hexdigest()
+    return f"browser_thread_{subject_hash}"
 
 
 def normalize_date(date_str: str) -> str:
@@ -85,31 +120,35 @@ def normalize_date(date_str: str) -> str:
     various date formats from different webmail providers.
     """
     # If already in RFC 2822 format, return as-is
-    if re.match(r'\w+, \d+ \w+ \d{4} \d{2}:\d{2}:\d{2}', date_str):
-        return date_str
-
-    # Try to parse and reformat
-    try:
-        # Handle common formats
-        for fmt in [
-            "%Y-%m-%d %H:%M:%S",
-            "%Y-%m-%dT%H:%M:%S",
-            "%m/%d/%Y %H:%M",
-            "%d/%m/%Y %H:%M",
-        ]:
-            try:
-                dt = datetime.strptime(date_str, fmt)
-                return dt.strftime("%a, %d %b %Y %H:%M:%S +0000")
-            except ValueError:
-                continue
-
-        # If no format matches, return as-is
+    if _RFC2822_RE.match(date_str):
         return date_str
-    except Exception:
-        return date_str
-
 
-def extract_emails_via_browser(url: str, folder: str, max_results: int, session_name: str = "gmail_corporate", use_mock: bool = False, full_body: bool = False) -> list[dict]:
+    # Handle common formats
+    match = _ISO_DATE_RE.fullmatch(date_str)
+    if match:
+        candidates = [match.groups()]
+    else:
+        match = _SLASH_DATE_RE.fullmatch(date_str)
+        if not match:
+            # If no format matches, return as-is
+            return date_str
+        first, second, year, hour, minute = match.groups()
+        # Month first (US), then day first
+        candidates = [
+            (year, first, second, hour, minute),
+            (year, second, first, hour, minute)
+        ]
+
+    for fields in candidates:
+        try:
+            dt = datetime(*map(int, fields))
+        except ValueError:
+            continue
+        return dt.strftime("%a, %d %b %Y %H:%M:%S +0000")
+    return date_str
+
+
+def extract_emails_via_browser(url: str, folder: str, max_results: int, session_name: str = "gmail_corporate", use_mock: bool = False, full_body: bool = False, use_playwright: bool = False, workers: int = 1, store_bodies: bool = False, verbose: bool = True) -> list[dict]:
     """
     Use agent-browser to navigate webmail and extract emails.
 
@@ -120,6 +159,10 @@ def extract_emails_via_browser(url: str, folder: str, max_results: int, session_
         session_name: Agent-browser session name (persists login)
         use_mock: If True, return mock data instead of real extraction
         full_body: If True, extract full email bodies (slower)
+        use_playwright: If True, drive the browser in-process with Playwright
+        workers: Parallel browser sessions (or Playwright tabs) for full bodies
+        store_bodies: If True, keep full bodies on disk for reuse (see EmailStore)
+        verbose: If True, print per-page and per-email progress lines
 
     Returns:
         List of email dicts with keys: subject, from, to, date, body
@@ -144,20 +187,16 @@ def extract_emails_via_browser(url: str, folder: str, max_results: int, session_
     print()
 
     try:
-        # Import the real extractor
-        from browser_gmail_extractor import GmailBrowserExtractor
-
-        # Create extractor with persistent session
-        extractor = GmailBrowserExtractor(
-            session_name=session_name,
-            headless=False  # Show browser for manual login
-        )
+        # Reuse this session's extractor from an earlier fetch, if any
+        extractor = _get_extractor(session_name, use_playwright, store_bodies, verbose)
 
         # Open Gmail (will prompt for manual login if needed)
         extractor.open_gmail(url)
 
         # Extract emails
-        emails = extractor.extract_emails(max_results=max_results, include_body=full_body)
+        emails = extractor.extract_emails(
+            max_results=max_results, include_body=full_body, workers=workers
+        )
 
         return emails
 
@@ -170,6 +209,32 @@ def extract_emails_via_browser(url: str, folder: str, max_results: int, session_
         raise RuntimeError(f"Browser extraction failed: {e}")
 
 
+def _get_extractor(session_name: str, use_playwright: bool = False, store_bodies: bool = False, verbose: bool = True):
+    """
+    Get the Gmail extractor for a browser session, creating it on first use.
+
+    Extractors are kept for the life of the process so repeated fetches on
+    the same session (and browser backend) skip the login check and initial
+    page load.
+    """
+    key = (session_name, use_playwright, store_bodies, verbose)
+    extractor = _EXTRACTORS.get(key)
+    if extractor is None:
+        # Import the real extractor
+        from browser_gmail_extractor import GmailBrowserExtractor
+
+        # Create extractor with persistent session
+        extractor = GmailBrowserExtractor(
+            session_name=session_name,
+            headless=False,  # Show browser for manual login
+            use_playwright=use_playwright,
+            use_store=store_bodies,
+            verbose=verbose
+        )
+        _EXTRACTORS[key] = extractor
+    return extractor
+
+
 def _generate_mock_emails(url: str, folder: str, max_results: int) -> list[dict]:
     """
     Generate mock emails for POC/testing.
@@ -178,32 +243,20 @@ def _generate_mock_emails(url: str, folder: str, max_results: int) -> list[dict]
     without actual browser automation.
     """
     # Determine provider-specific mock data
-    if "gmail.com" in url:
-        provider_name = "Corporate Gmail"
-        from_domain = "company.com"
-    elif "outlook.office365.com" in url:
-        provider_name = "Outlook 365"
-        from_domain = "company.com"
-    elif "outlook.office.com" in url or "outlook.com" in url:
-        provider_name = "Exchange Online"
-        from_domain = "company.com"
-    else:
-        provider_name = "Webmail"
-        from_domain = "example.com"
-
-    # Generate sample emails for POC
-    mock_emails = []
-    for i in range(min(max_results, 5)):  # Limit to 5 for POC
-        email = {
-            "subject": f"Sample Email {i+1} from {provider_name}",
-            "from": f"Sender{i+1} <sender{i+1}@{from_domain}>",
+    _, provider_name, from_domain = _detect_provider(url)
+
+    # Generate sample emails for POC (all share one timestamp)
+    date = datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0000")
+    return [
+        {
+            "subject": f"Sample Email {n} from {provider_name}",
+            "from": f"Sender{n} <sender{n}@{from_domain}>",
             "to": "user@company.com",
-            "date": datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0000"),
-            "body": f"This is a sample email body extracted from {provider_name} via agent-browser.\n\nEmail #{i+1} in {folder} folder.\n\nThis demonstrates the browser-based email extraction for corporate webmail that blocks API access."
+            "date": date,
+            "body": f"This is a sample email body extracted from {provider_name} via agent-browser.\n\nEmail #{n} in {folder} folder.\n\nThis demonstrates the browser-based email extraction for corporate webmail that blocks API access."
         }
-        mock_emails.append(email)
-
-    return mock_emails
+        for n in range(1, min(max_results, 5) + 1)  # Limit to 5 for POC
+    ]
 
 
 def normalize_to_gmail_schema(browser_emails: list[dict], url: str) -> list[dict]:
@@ -231,33 +284,37 @@ def normalize_to_gmail_schema(browser_emails: list[dict], url: str) -> list[dict
         "body": "..."
     }
     """
-    normalized = []
+    return list(iter_gmail_schema(browser_emails, url))
 
-    for idx, email in enumerate(browser_emails):
-        email_id = generate_email_id(idx + 1, url)
-        thread_id = generate_thread_id(idx + 1, email.get("subject", ""))
 
-        # Extract snippet (first 200 chars of body)
-        body = email.get("body", "")
-        snippet = body[:200] + "..." if len(body) > 200 else body
+def iter_gmail_schema(browser_emails: list[dict], url: str) -> Iterator[dict]:
+    """
+    Lazily transform browser-extracted emails to Gmail API schema.
 
-        normalized_email = {
-            "id": email_id,
-            "threadId": thread_id,
+    Same output as normalize_to_gmail_schema(), one email at a time.
+    """
+    # Local names for the per-email helpers
+    gen_id, gen_thread_id, norm_date = generate_email_id, generate_thread_id, normalize_date
+    provider = _detect_provider(url)[0]
+
+    return (
+        {
+            "id": gen_id(idx, provider),
+            "threadId": gen_thread_id(idx, email.get("subject", "")),
             "subject": email.get("subject", "(No subject)"),
             "from": email.get("from", "(Unknown sender)"),
             "to": email.get("to", ""),
-            "date": normalize_date(email.get("date", "")),
-            "snippet": snippet,
+            "date": norm_date(email.get("date", "")),
+            # Short bodies are their own snippet (no copy)
+            "snippet": body if len(body) <= _SNIPPET_LENGTH else body[:_SNIPPET_LENGTH] + _SNIPPET_ELLIPSIS,
             "body": body
         }
-
-        normalized.append(normalized_email)
-
-    return normalized
+        for idx, email in enumerate(browser_emails, 1)
+        for body in (email.get("body", ""),)
+    )
 
 
-def fetch_via_browser(url: str, folder: str, max_results: int, session_name: str = "gmail_corporate", use_mock: bool = False, full_body: bool = False) -> dict:
+def fetch_via_browser(url: str, folder: str, max_results: int, session_name: str = "gmail_corporate", use_mock: bool = False, full_body: bool = False, use_playwright: bool = False, workers: int = 1, store_bodies: bool = False, verbose: bool = True) -> dict:
     """
     Main fetch function: orchestrate browser extraction and normalization.
 
@@ -268,12 +325,83 @@ def fetch_via_browser(url: str, folder: str, max_results: int, session_name: str
         session_name: Browser session name (persists login)
         use_mock: If True, use mock data instead of real browser
         full_body: If True, extract full email bodies (slower)
+        use_playwright: If True, drive the browser in-process with Playwright
+        workers: Parallel browser sessions (or Playwright tabs) for full bodies
+        store_bodies: If True, keep full bodies on disk for reuse (see EmailStore)
+        verbose: If True, print per-page and per-email progress lines
 
     Returns:
         Dictionary with status, messages, and metadata (Gmail API format)
     """
+    browser_emails = _extract(
+        url, folder, max_results, session_name, use_mock, full_body, use_playwright, workers,
+        store_bodies, verbose
+    )
+
+    # Normalize to Gmail schema
+    normalized_emails = normalize_to_gmail_schema(browser_emails, url)
+
+    # Build response in Gmail API format
+    return {
+        "status": "success",
+        "messages": normalized_emails,
+        "result_count": len(normalized_emails),
+        "metadata": _build_metadata(
+            url, folder, max_results, session_name, use_mock, full_body,
+            len(normalized_emails)
+        )
+    }
+
+
+def fetch_to_file(output_path: Path, url: str, folder: str, max_results: int, session_name: str = "gmail_corporate", use_mock: bool = False, full_body: bool = False, use_playwright: bool = False, workers: int = 1, store_bodies: bool = False, verbose: bool = True) -> int:
+    """
+    Fetch emails and write the fetch_via_browser() response to a JSON file.
+
+    Messages are normalized and written one at a time, so the normalized
+    list and the full serialized document are never held in memory.
+
+    Args:
+        output_path: File to write
+        url: Webmail URL
+        folder: Folder name
+        max_results: Max emails to fetch
+        session_name: Browser session name (persists login)
+        use_mock: If True, use mock data instead of real browser
+        full_body: If True, extract full email bodies (slower)
+        use_playwright: If True, drive the browser in-process with Playwright
+        workers: Parallel browser sessions (or Playwright tabs) for full bodies
+        store_bodies: If True, keep full bodies on disk for reuse (see EmailStore)
+        verbose: If True, print per-page and per-email progress lines
+
+    Returns:
+        Number of emails written
+    """
+    browser_emails = _extract(
+        url, folder, max_results, session_name, use_mock, full_body, use_playwright, workers,
+        store_bodies, verbose
+    )
+
+    count = 0
+    with open(output_path, "wb") as f:
+        f.write(b'{"status": "success", "messages": [')
+        for email in iter_gmail_schema(browser_emails, url):
+            f.write(b",\n" if count else b"\n")
+            f.write(_dumps(email))
+            count += 1
+        metadata = _build_metadata(
+            url, folder, max_results, session_name, use_mock, full_body, count
+        )
+        f.write(b'\n], "result_count": %d, "metadata": ' % count)
+        f.write(_dumps(metadata))
+        f.write(b"}\n")
+    return count
+
+
+def _extract(url: str, folder: str, max_results: int, session_name: str, use_mock: bool, full_body: bool, use_playwright: bool = False, workers: int = 1, store_bodies: bool = False, verbose: bool = True) -> list[dict]:
+    """Check prerequisites, warn about limits, and extract emails (real or mock)."""
     # Check if agent-browser is installed when using real extraction
-    if not use_mock and not check_agent_browser_installed():
+    # (the Playwright backend drives the browser without it)
+    if not use_mock and not use_playwright and not check_agent_browser_installed():
         print(
             "ERROR: agent-browser not found. Install with: npm install -g agent-browser",
             file=sys.stderr
@@ -316,34 +444,27 @@ def fetch_via_browser(url: str, folder: str, max_results: int, session_name: str
         print(file=sys.stderr)
 
     # Extract emails via browser (real or mock)
-    browser_emails = extract_emails_via_browser(
-        url, folder, actual_max, session_name, use_mock, full_body
+    return extract_emails_via_browser(
+        url, folder, actual_max, session_name, use_mock, full_body, use_playwright, workers,
+        store_bodies, verbose
     )
 
-    # Normalize to Gmail schema
-    normalized_emails = normalize_to_gmail_schema(browser_emails, url)
 
-    # Build response in Gmail API format
-    response = {
-        "status": "success",
-        "messages": normalized_emails,
-        "result_count": len(normalized_emails),
-        "metadata": {
-            "source": "browser_mock" if use_mock else "browser_real",
-            "webmail_url": url,
-            "folder": folder,
-            "format": "full",
-            "extraction_mode": "full_body" if full_body else "snippet",
-            "timestamp": datetime.now().isoformat(),
-            "session": session_name if not use_mock else "mock",
-            "requested_count": max_results,
-            "actual_count": len(normalized_emails),
-            "limitation_note": "Browser extraction limited to ~50-100 emails per request" if max_results > 100 else None
-        }
+def _build_metadata(url: str, folder: str, max_results: int, session_name: str, use_mock: bool, full_body: bool, count: int) -> dict:
+    """Build the metadata section of a fetch response."""
+    return {
+        "source": "browser_mock" if use_mock else "browser_real",
+        "webmail_url": url,
+        "folder": folder,
+        "format": "full",
+        "extraction_mode": "full_body" if full_body else "snippet",
+        "timestamp": datetime.now().isoformat(),
+        "session": session_name if not use_mock else "mock",
+        "requested_count": max_results,
+        "actual_count": count,
+        "limitation_note": "Browser extraction limited to ~50-100 emails per request" if max_results > 100 else None
     }
 
-    return response
-
 
 def main():
     """CLI entry point for browser email fetcher."""
@@ -418,7 +539,7 @@ How It Works:
     parser.add_argument(
         "--verbose",
         action="store_true",
-        help="Enable verbose output"
+        help="Enable verbose output, including per-page and per-email extraction progress"
     )
 
     parser.add_argument(
@@ -439,6 +560,26 @@ How It Works:
         help="Extract full email bodies by clicking each email (slower, ~3s per email)"
     )
 
+    parser.add_argument(
+        "--playwright",
+        action="store_true",
+        help="Drive the browser in-process with Playwright instead of agent-browser (requires playwright)"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Parallel browser sessions (Playwright: tabs) for multi-page --full-body extraction (default: 1)"
+    )
+
+    parser.add_argument(
+        "--store-bodies",
+        action="store_true",
+        help="Keep --full-body emails in ~/.cache/gmail_extractor (unencrypted, owner-only, "
+             "expire after 7 days) so later runs skip re-opening them"
+    )
+
     args = parser.parse_args()
 
     # Validate URL
@@ -462,29 +603,31 @@ How It Works:
             if not args.mock:
                 print(f"Session: {args.session}", file=sys.stderr)
 
-        # Fetch emails via browser
-        result = fetch_via_browser(
+        # Fetch emails via browser, streaming them to the output file
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        count = fetch_to_file(
+            output_path,
             args.url,
             args.folder,
             args.max_results,
             args.session,
             args.mock,
-            args.full_body
+            args.full_body,
+            args.playwright,
+            args.workers,
+            args.store_bodies,
+            args.verbose
         )
 
-        # Write to output file
-        output_path = Path(args.output)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(json.dumps(result, indent=2))
-
         if args.verbose:
-            print(f"\nSuccessfully fetched {result['result_count']} emails", file=sys.stderr)
+            print(f"\nSuccessfully fetched {count} emails", file=sys.stderr)
             print(f"Output written to: {args.output}", file=sys.stderr)
 
         # Print success message to stdout (for chaining with other scripts)
         print(json.dumps({
             "status": "success",
-            "count": result["result_count"],
+            "count": count,
             "output_file": args.output
         }))
 
@@ -6,18 +6,359 @@ This module provides the actual browser automation to extract emails from Gmail
 when API access is blocked.
 """
 
+import atexit
 import json
+import os
+import sqlite3
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Optional
 from datetime import datetime
 
+from gmail_json import dumps as _dumps, loads as _loads
+
+try:
+    from playwright.sync_api import Error as PlaywrightError, sync_playwright
+except ImportError:  # Optional in-process backend; agent-browser is used otherwise
+    sync_playwright = None
+
+# Email rows of the inbox list (JavaScript expression); :has() lets the
+# selector engine skip rows without cells, scanned by hand where unsupported
+_LIST_ROWS_JS = (
+    "(CSS.supports('selector(:has(*))')"
+    " ? Array.from(document.querySelectorAll('tr.zA:has(td)'))"
+    " : Array.from(document.querySelectorAll('tr.zA'))"
+    ".filter(row => row.querySelector('td') !== null))"
+)
+
+# Page-state checks waited on instead of fixed sleeps
+_MESSAGE_OPEN_JS = "!!(document.querySelector('.ii') || document.querySelector('.a3s'))"
+_LIST_READY_JS = "document.querySelectorAll('tr.zA').length > 0"
+# Inbox rendered, or a sign-in page shown instead
+_INBOX_OR_LOGIN_JS = _LIST_READY_JS + " || /sign in|login/i.test(document.title)"
+# Next page shown after _click_older_button()
+_PAGE_CHANGED_JS = "location.hash !== window.__agentPrevHash && " + _LIST_READY_JS
+
+# Reads the open message's fields (JavaScript function expression)
+_READ_MESSAGE_JS = """() => {
+    // Find subject - Gmail uses h2 for subject in opened email
+    const subject = document.querySelector('h2')?.textContent ||
+                   document.querySelector('.hP')?.textContent ||
+                   '(No subject)';
+
+    // Find sender - look for email attribute on sender elements
+    const senderElem = document.querySelector('.gD[email]') ||
+                      document.querySelector('.go[email]') ||
+                      document.querySelector('[email]');
+    const from = senderElem?.getAttribute('email') ||
+                senderElem?.textContent ||
+                '(Unknown sender)';
+
+    // Find date - Gmail shows date in various places
+    const g3 = document.querySelector('.g3');
+    const dateElem = g3?.getAttribute('title') ||
+                    document.querySelector('[data-tooltip]')?.getAttribute('data-tooltip') ||
+                    g3?.textContent ||
+                    new Date().toISOString();
+
+    // Find email body - Gmail uses div.ii for message body
+    const bodyElem = document.querySelector('.ii') ||
+                    document.querySelector('.a3s');
+    const body = bodyElem?.textContent ||
+                '(Body not available)';
+
+    // Find recipients - to field
+    const toElems = document.querySelectorAll('.g2[email]');
+    const to = Array.from(toElems)
+        .map(el => el.getAttribute('email'))
+        .filter(Boolean)
+        .join(', ') || '';
+
+    return {
+        subject: subject.trim(),
+        from: from.trim(),
+        to: to.trim(),
+        date: dateElem,
+        body: body.slice(0, 10000).trim() // Limit body size (before trimming)
+    };
+}"""
+
+# Resolves true once condition() holds, or to condition()'s final value
+# after timeoutMs (JavaScript function expression)
+_WAIT_FOR_JS = """(condition, timeoutMs) => new Promise(resolve => {
+    if (condition()) return resolve(true);
+    const observer = new MutationObserver(() => {
+        if (condition()) { observer.disconnect(); clearTimeout(timer); resolve(true); }
+    });
+    const timer = setTimeout(() => { observer.disconnect(); resolve(!!condition()); }, timeoutMs);
+    observer.observe(document.body, {childList: true, subtree: true, attributes: true});
+})"""
+
+# Opens each of the rows at `indices` in turn, reads it and returns to the
+# list, all in one evaluation; null for rows that did not open (JavaScript
+# async function expression)
+_READ_ROWS_JS = """async (indices) => {
+    const waitFor = """ + _WAIT_FOR_JS + """;
+    const readMessage = """ + _READ_MESSAGE_JS + """;
+    const listRows = () => """ + _LIST_ROWS_JS + """;
+    const messageOpen = () => """ + _MESSAGE_OPEN_JS + """;
+
+    const emails = [];
+    for (const i of indices) {
+        const row = listRows()[i];
+        if (!row) break;
+        // The previous message can still be shown right after the click;
+        // only read once this row's thread (or at least a new URL) is open
+        const threadId = row.querySelector('[data-legacy-thread-id]')?.getAttribute('data-legacy-thread-id');
+        const listHash = location.hash;
+        const opened = threadId
+            ? () => !!document.querySelector('h2[data-legacy-thread-id=' + JSON.stringify(threadId) + ']') && messageOpen()
+            : () => location.hash !== listHash && messageOpen();
+        row.click();
+        emails.push(await waitFor(opened, 3000) ? readMessage() : null);
+        history.back();
+        await waitFor(() => !messageOpen() && listRows().length > i, 3000);
+    }
+    return emails;
+}"""
+
+# Number of email rows on the current list page, up to maxResults
+# (JavaScript function expression, see get_email_list_elements)
+_COUNT_ROWS_JS = "(maxResults = Infinity) => " + _LIST_ROWS_JS + ".slice(0, maxResults).length"
+
+# Clicks the email row at `index`; whether it did, and the number of rows
+# (JavaScript function expression, see extract_email_from_row)
+_CLICK_ROW_JS = """(index) => {
+    const rows = """ + _LIST_ROWS_JS + """;
+    if (rows[index]) {
+        rows[index].click();
+        return {clicked: true, totalRows: rows.length};
+    }
+    return {clicked: false, totalRows: rows.length};
+}"""
+
+# Current list location and the Gmail thread id of each of the first
+# maxResults rows (null where a row has none) (JavaScript function expression)
+_READ_THREAD_IDS_JS = """(maxResults) => ({
+    hash: location.hash,
+    ids: """ + _LIST_ROWS_JS + """.slice(0, maxResults).map(row =>
+        row.querySelector('[data-legacy-thread-id]')?.getAttribute('data-legacy-thread-id') || null)
+})"""
+
+# Finds and clicks the [Older] button; true if clicked (JavaScript function
+# expression, see _click_older_button)
+_CLICK_OLDER_JS = """() => {
+    // Strategy 1: Find by aria-label
+    let olderBtn = Array.from(document.querySelectorAll('button, div[role="button"]'))
+        .find(btn => {
+            const label = btn.getAttribute('aria-label') || btn.textContent || '';
+            return label.toLowerCase().includes('older');
+        });
+
+    // Strategy 2: Find in navigation div
+    if (!olderBtn) {
+        const navDiv = document.querySelector('div[role="navigation"]');
+        if (navDiv) {
+            const buttons = navDiv.querySelectorAll('button');
+            if (buttons.length >= 2) {
+                olderBtn = buttons[buttons.length - 1];  // Rightmost button
+            }
+        }
+    }
+
+    // Strategy 3: Find by title/tooltip
+    if (!olderBtn) {
+        olderBtn = document.querySelector('[title*="Older"], [data-tooltip*="Older"]');
+    }
+
+    // Strategy 4: Check if button is enabled and click
+    if (olderBtn && olderBtn.getAttribute('aria-disabled') !== 'true') {
+        // Remembered so the next page can be detected
+        window.__agentPrevHash = location.hash;
+        olderBtn.click();
+        return true;
+    }
+    return false;
+}"""
+
+# Reads the first maxResults rows of the current list page (JavaScript
+# function expression, see _extract_emails_from_current_page)
+_READ_LIST_ROWS_JS = """(maxResults) => {
+    const rows = """ + _LIST_ROWS_JS + """.slice(0, maxResults);
+
+    return rows.map(row => {
+        // Direct cells; avoids building a NodeList per row
+        const cells = row.children;
+
+        // Extract sender (typically cell 3 or 4)
+        const senderCell = cells[3] || cells[4];
+        const sender = senderCell?.querySelector('[email]')?.getAttribute('email') ||
+                      senderCell?.querySelector('.yP, .yW')?.innerText ||
+                      senderCell?.innerText?.trim() ||
+                      '(Unknown sender)';
+
+        // Extract subject and snippet (typically cell 4 or 5)
+        const subjectCell = cells[4] || cells[5];
+        const subjectText = subjectCell?.innerText?.trim() || '(No subject)';
+
+        // Try to separate subject from snippet (first line is the subject)
+        const nl = subjectText.indexOf('\\n');
+        let subject = subjectText;
+        let snippet = subjectText;
+        if (nl >= 0) {
+            subject = subjectText.slice(0, nl);
+            snippet = subjectText.slice(nl + 1).replace(/\\n/g, ' ');
+        }
+
+        // Extract date (typically one of the last cells)
+        const last = cells.length - 1;
+        const dateCell = cells[last - 1] || cells[last];
+        const date = dateCell?.querySelector('span')?.getAttribute('title') ||
+                    dateCell?.innerText?.trim() ||
+                    new Date().toISOString();
+
+        const body = snippet;
+
+        // Create unique ID for deduplication (subject||sender||date)
+        const uniqueId = subject.slice(0, 100) + '||' + sender + '||' + date;
+
+        return {
+            subject: subject.slice(0, 500),
+            from: sender,
+            to: '',  // Not available in list view
+            date: date,
+            body: body.slice(0, 10000),
+            _page_unique_id: uniqueId
+        };
+    });
+}"""
+
+# Reads list pages, clicking [Older] between them, until `target` unique
+# emails are seen, maxPages pages are read, or pages stop yielding new
+# emails; returns the rows of each page (JavaScript async function expression)
+_PAGINATE_JS = """async (target, maxPages, pageSize) => {
+    const waitFor = """ + _WAIT_FOR_JS + """;
+    const readRows = """ + _READ_LIST_ROWS_JS + """;
+    const clickOlder = """ + _CLICK_OLDER_JS + """;
+    const pageChanged = () => """ + _PAGE_CHANGED_JS + """;
+
+    const pages = [];
+    const seen = new Set();
+    let stalls = 0;
+    while (pages.length < maxPages) {
+        const rows = readRows(Math.min(pageSize, target - seen.size));
+        pages.push(rows);
+        if (rows.length === 0) break;
+
+        const before = seen.size;
+        rows.forEach(row => seen.add(row._page_unique_id));
+        stalls = seen.size === before ? stalls + 1 : 0;
+        if (stalls >= 2 || seen.size >= target) break;
+
+        if (pages.length >= maxPages || !clickOlder()) break;
+        await waitFor(pageChanged, 2500);
+    }
+    return pages;
+}"""
+
 
 class AgentBrowserError(Exception):
     """Error running agent-browser command."""
     pass
 
 
+class EmailStore:
+    """
+    On-disk store of full emails already read, keyed by list row id.
+
+    Opening a message costs seconds, so full-body extraction looks rows up
+    here first and only opens the ones not read on an earlier run. Rows are
+    identified by the _page_unique_id of the list view (subject, sender and
+    date), which does not change once an email is received.
+
+    Email bodies are stored unencrypted, so the store lives in the user's
+    cache directory (readable by the user only) and entries expire after
+    max_age_days.
+    """
+
+    def __init__(
+        self,
+        session_name: str,
+        cache_dir: Optional[str] = None,
+        max_age_days: float = 7
+    ):
+        """
+        Open (or create) the store for a browser session.
+
+        Args:
+            session_name: Agent-browser session name (one store per mailbox)
+            cache_dir: Directory for store files
+                (default: $XDG_CACHE_HOME/gmail_extractor or ~/.cache/gmail_extractor)
+            max_age_days: Drop stored emails read longer ago than this
+        """
+        if cache_dir:
+            # The caller's directory; only set permissions if created here
+            self.cache_dir = Path(cache_dir)
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        else:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+            self.cache_dir = Path(cache_home) / "gmail_extractor"
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            self.cache_dir.chmod(0o700)
+        self.path = self.cache_dir / f"{session_name or 'default'}.db"
+        # Create the file owner-only before sqlite opens it
+        os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+        self.path.chmod(0o600)
+
+        self.max_age = max_age_days * 86400
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS emails "
+                "(uid TEXT PRIMARY KEY, json TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "DELETE FROM emails WHERE fetched_at < ?", (time.time() - self.max_age,)
+            )
+
+    def get_many(self, uids: list[str]) -> dict[str, dict]:
+        """
+        Look up stored emails.
+
+        Args:
+            uids: Row ids to look up
+
+        Returns:
+            Dict of row id to email, for the ids that are stored
+        """
+        if not uids:
+            return {}
+        placeholders = ",".join("?" * len(uids))
+        rows = self._conn.execute(
+            f"SELECT uid, json FROM emails WHERE uid IN ({placeholders}) AND fetched_at >= ?",
+            [*uids, time.time() - self.max_age]
+        )
+        return {uid: json.loads(data) for uid, data in rows}
+
+    def put_many(self, emails: dict[str, dict]) -> None:
+        """
+        Store emails, keeping any already stored under the same id.
+
+        Args:
+            emails: Dict of row id to email
+        """
+        if not emails:
+            return
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO emails (uid, json, fetched_at) VALUES (?, ?, ?)",
+                [(uid, json.dumps(email), now) for uid, email in emails.items()]
+            )
+
+
 class GmailBrowserExtractor:
     """
     Extract emails from Gmail using agent-browser automation.
@@ -29,16 +370,137 @@ class GmailBrowserExtractor:
     - Individual email content extraction
     """
 
-    def __init__(self, session_name: str = "gmail_corporate", headless: bool = True):
+    def __init__(
+        self,
+        session_name: str = "gmail_corporate",
+        headless: bool = True,
+        use_store: bool = False,
+        verbose: bool = True,
+        use_playwright: bool = False
+    ):
         """
         Initialize Gmail browser extractor.
 
         Args:
             session_name: Agent-browser session name (persists cookies/auth)
             headless: Run in headless mode (False = show browser window)
+            use_store: Keep full emails on disk and reuse them on later runs
+                (see EmailStore; off by default since bodies are stored
+                unencrypted)
+            verbose: Print per-page and per-email progress lines
+            use_playwright: Drive Chromium in-process through Playwright
+                instead of one agent-browser process per command. The
+                login is kept in its own profile
+                (~/.gmail_browser_profiles/<session_name>), so the first
+                run needs headless=False to log in.
         """
         self.session_name = session_name
         self.headless = headless
+        self.verbose = verbose
+        # Per-page/per-email progress lines, dropped unless verbose
+        self._log = print if verbose else (lambda *args, **kwargs: None)
+        self._store = EmailStore(session_name) if use_store else None
+
+        # Command prefix shared by every agent-browser call
+        self._base_cmd = ["agent-browser"]
+        # Only add session flag if session_name is provided and not empty
+        if session_name:
+            self._base_cmd.extend(["--session", session_name])
+        if not headless:
+            self._base_cmd.append("--headed")
+        self._json_cmd = self._base_cmd + ["--json"]
+        # URL of the Gmail inbox already opened (and logged in) by this extractor
+        self._opened_url: Optional[str] = None
+        # Rows on the list page, as last seen by extract_email_from_row()
+        self._list_row_count: Optional[int] = None
+
+        # In-process browser page when use_playwright is set
+        self._page = None
+        if use_playwright:
+            self._start_playwright()
+
+    def _start_playwright(self) -> None:
+        """
+        Launch a persistent Chromium context for this session.
+
+        Raises:
+            AgentBrowserError: If Playwright is not installed or fails to start
+        """
+        if sync_playwright is None:
+            raise AgentBrowserError(
+                "use_playwright requires Playwright: "
+                "pip install playwright && playwright install chromium"
+            )
+
+        # The profile holds the login cookies; keep it readable by the user only
+        profiles_dir = Path.home() / ".gmail_browser_profiles"
+        profile_dir = profiles_dir / (self.session_name or "default")
+        for directory in (profiles_dir, profile_dir):
+            directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            directory.chmod(0o700)
+
+        self._playwright = None
+        try:
+            self._playwright = sync_playwright().start()
+            self._context = self._playwright.chromium.launch_persistent_context(
+                str(profile_dir), headless=self.headless
+            )
+        except PlaywrightError as e:
+            # Don't leave the driver process running
+            if self._playwright is not None:
+                self._playwright.stop()
+            raise AgentBrowserError(f"Failed to start Playwright: {e}")
+        pages = self._context.pages
+        self._page = pages[0] if pages else self._context.new_page()
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """Close the Playwright browser, if one was started."""
+        if self._page is None:
+            return
+        self._page = None
+        try:
+            self._context.close()
+            self._playwright.stop()
+        except PlaywrightError:
+            pass
+
+    def _run_playwright(self, args: tuple, expect_json: bool, timeout: int) -> dict | str:
+        """
+        Run an agent-browser style command on the Playwright page.
+
+        Supports the commands this extractor uses (open, eval, get title,
+        back) and returns what agent-browser would.
+
+        Args:
+            args: Command arguments
+            expect_json: Return the response data dict
+            timeout: Navigation timeout in seconds
+
+        Returns:
+            Response data dict if expect_json=True, otherwise an empty string
+
+        Raises:
+            AgentBrowserError: If the command fails or is not supported
+        """
+        command, *rest = args
+        try:
+            if command == "open":
+                self._page.goto(rest[0], timeout=timeout * 1000)
+                data = {}
+            elif command == "eval":
+                data = {"result": self._page.evaluate(rest[0])}
+            elif command == "get" and rest == ["title"]:
+                data = {"value": self._page.title()}
+            elif command == "back":
+                self._page.go_back(timeout=timeout * 1000)
+                data = {}
+            else:
+                raise AgentBrowserError(f"Command not supported with Playwright: {' '.join(args)}")
+        except PlaywrightError as e:
+            raise AgentBrowserError(f"Command failed: {' '.join(map(str, args))[:200]}\n{e}")
+
+        return data if expect_json else ""
 
     def _run_command(self, *args, expect_json: bool = False, timeout: int = 30) -> dict | str:
         """
@@ -55,25 +517,16 @@ class GmailBrowserExtractor:
         Raises:
             AgentBrowserError: If command fails
         """
-        cmd = ["agent-browser"]
-
-        # Only add session flag if session_name is provided and not empty
-        if self.session_name:
-            cmd.extend(["--session", self.session_name])
-
-        if not self.headless:
-            cmd.append("--headed")
+        if self._page is not None:
+            return self._run_playwright(args, expect_json, timeout)
 
-        if expect_json:
-            cmd.append("--json")
-
-        cmd.extend(str(arg) for arg in args)
+        cmd = [*(self._json_cmd if expect_json else self._base_cmd), *map(str, args)]
 
         try:
+            # Output is kept as bytes; only text results are decoded
             result = subprocess.run(
                 cmd,
                 capture_output=True,
-                text=True,
                 timeout=timeout
             )
 
@@ -81,39 +534,84 @@ class GmailBrowserExtractor:
                 raise AgentBrowserError(
                     f"Command failed: {' '.join(cmd)}\n"
                     f"Exit code: {result.returncode}\n"
-                    f"Stderr: {result.stderr}"
+                    f"Stderr: {result.stderr.decode('utf-8', 'replace')}"
                 )
 
             if expect_json:
-                response = json.loads(result.stdout)
+                response = _loads(result.stdout)
                 if not response.get("success"):
                     raise AgentBrowserError(
                         f"Command returned error: {response.get('error', 'Unknown error')}"
                     )
                 return response.get("data", {})
 
-            return result.stdout.strip()
+            return result.stdout.decode('utf-8', 'replace').strip()
 
         except subprocess.TimeoutExpired:
             raise AgentBrowserError(f"Command timed out after {timeout}s")
         except json.JSONDecodeError as e:
-            raise AgentBrowserError(f"Failed to parse JSON output: {e}\n{result.stdout}")
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            raise AgentBrowserError(
+                f"Failed to parse JSON output: {e}\n{result.stdout.decode('utf-8', 'replace')}"
+            )
         except Exception as e:
             raise AgentBrowserError(f"Unexpected error: {e}")
 
+    def _wait_for(self, js_condition: str, timeout: float) -> bool:
+        """
+        Wait inside the page until a JavaScript condition is truthy.
+
+        The page re-checks the condition on every DOM mutation, so this
+        returns as soon as the page is ready, in one agent-browser call.
+        With the Playwright backend, page.wait_for_function does the same.
+
+        Args:
+            js_condition: JavaScript expression to evaluate
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the condition was met, False on timeout or error
+        """
+        if self._page is not None:
+            try:
+                self._page.wait_for_function(
+                    js_condition, polling="mutation", timeout=timeout * 1000
+                )
+                return True
+            except PlaywrightError:
+                return False
+
+        js_wait = f"({_WAIT_FOR_JS})(() => ({js_condition}), {int(timeout * 1000)})"
+        try:
+            result = self._run_command(
+                "eval", js_wait, expect_json=True, timeout=int(timeout) + 30
+            )
+        except AgentBrowserError:
+            return False
+        return bool(result.get("result"))
+
     def open_gmail(self, url: str = "https://mail.google.com/mail/u/0") -> None:
         """
         Open Gmail and wait for login if needed.
 
+        If this extractor already opened the same URL, the session is known to
+        be logged in, so it only navigates back to the first page.
+
         Args:
             url: Gmail URL to open
         """
+        if url == self._opened_url:
+            print(f"Returning to {url}...")
+            self._run_command("open", url, timeout=60)
+            self._wait_for(_LIST_READY_JS, timeout=2)
+            return
+
         print(f"Opening Gmail at {url}...")
         self._run_command("open", url, timeout=60)
 
         # Wait for page to load
         print("Waiting for Gmail to load...")
-        time.sleep(5)
+        self._wait_for(_INBOX_OR_LOGIN_JS, timeout=5)
 
         # Check if we need to login
         title = self._run_command("get", "title", expect_json=True)
@@ -137,7 +635,9 @@ class GmailBrowserExtractor:
 
             input("\nPress Enter once you've logged in and Gmail inbox is visible...")
 
-    def get_email_list_elements(self, max_results: int = 10) -> list[str]:
+        self._opened_url = url
+
+    def get_email_list_elements(self, max_results: int = 10) -> range:
         """
         Get list of email row elements from Gmail inbox.
 
@@ -148,44 +648,37 @@ class GmailBrowserExtractor:
             max_results: Maximum number of emails to find
 
         Returns:
-            List of element selectors for email rows
+            Indices of the email rows, for extract_email_from_row()
         """
         print(f"Finding email rows (max {max_results})...")
 
         # Gmail email rows are typically in a table with role="row"
         # We'll use JavaScript to find them
-        js_code = f"""
-        (() => {{
-            // Find email rows - Gmail uses tr.zA for email rows
-            const rows = Array.from(document.querySelectorAll('tr.zA'))
-                .filter(row => {{
-                    // Filter out non-email rows
-                    // Gmail email rows have class 'zA' and are in the main table
-                    return row.querySelector('td') !== null;
-                }})
-                .slice(0, {max_results});
-
-            // Return count for debugging
-            return rows.length;
-        }})()
-        """
+        js_code = f"({_COUNT_ROWS_JS})({json.dumps(max_results)})"
 
         result = self._run_command("eval", js_code, expect_json=True)
         count = result.get("result", 0)
 
         print(f"Found {count} email rows")
 
-        # Return selectors for the rows
-        return [f"tr.zA:nth-child({i+1})" for i in range(count)]
+        # Rows are addressed by index, no per-row selector needed
+        return range(count)
 
-    def extract_email_from_row(self, row_index: int) -> Optional[dict]:
+    def extract_email_from_row(self, row_index: int, thread_id: Optional[str] = None) -> Optional[dict]:
         """
         Extract email data from a specific row.
 
         This clicks the email to open it, extracts content, then goes back.
+        The number of rows on the page is recorded in _list_row_count, so
+        callers need no separate count.
+
+        With a thread_id (see _extract_rows_by_thread_id) the thread is opened
+        by URL instead and the browser stays on it; there is no click, no
+        back navigation, and a retry simply opens the URL again.
 
         Args:
             row_index: Index of email row (0-based)
+            thread_id: Gmail thread id of the row, if known
 
         Returns:
             Email dict with subject, from, to, date, body, or None if failed
@@ -194,91 +687,67 @@ class GmailBrowserExtractor:
         for attempt in range(max_retries):
             try:
                 if attempt == 0:
-                    print(f"  Extracting email {row_index + 1}...")
+                    self._log(f"  Extracting email {row_index + 1}...")
                 else:
-                    print(f"  Email {row_index + 1}: Retry {attempt}/{max_retries - 1}")
+                    self._log(f"  Email {row_index + 1}: Retry {attempt}/{max_retries - 1}")
+
+                if thread_id:
+                    # Same folder, this thread (e.g. #inbox/p2 -> #inbox/<id>)
+                    tid = json.dumps(thread_id)
+                    self._run_command(
+                        "eval", f"location.hash = location.hash.split('/')[0] + '/' + {tid}",
+                        expect_json=True
+                    )
+                    # The previous thread's body may still be shown; wait for this one
+                    opened = self._wait_for(
+                        f"document.querySelector('h2[data-legacy-thread-id=' + JSON.stringify({tid}) + ']') "
+                        f"&& {_MESSAGE_OPEN_JS}",
+                        timeout=5
+                    )
+                    email_data = opened and self._run_command(
+                        "eval", f"({_READ_MESSAGE_JS})()", expect_json=True
+                    ).get("result")
+                    if email_data and email_data.get("subject"):
+                        return email_data
+                    if attempt < max_retries - 1:
+                        continue
+                    print(f"  Email {row_index + 1}: Failed after {max_retries} attempts")
+                    return None
 
                 # Click the email row using JavaScript (more reliable than CSS selector)
-                click_js = f"""
-                (() => {{
-                    const rows = Array.from(document.querySelectorAll('tr.zA'))
-                        .filter(row => row.querySelector('td') !== null);
-                    if (rows[{row_index}]) {{
-                        rows[{row_index}].click();
-                        return true;
-                    }}
-                    return false;
-                }})()
-                """
-
-                click_result = self._run_command("eval", click_js, expect_json=True)
-                if not click_result.get("result"):
+                click_js = f"({_CLICK_ROW_JS})({json.dumps(row_index)})"
+
+                click_result = self._run_command("eval", click_js, expect_json=True).get("result") or {}
+                self._list_row_count = click_result.get("totalRows")
+                if not click_result.get("clicked"):
+                    if self._list_row_count and row_index >= self._list_row_count:
+                        # Past the last row of a loaded list; retrying won't help
+                        return None
                     if attempt < max_retries - 1:
-                        time.sleep(2)
+                        # List not rendered yet
+                        self._wait_for(_LIST_READY_JS, timeout=2)
                         continue
                     else:
                         print(f"  Email {row_index + 1}: Could not find row after {max_retries} attempts")
                         return None
 
                 # Wait for email to open
-                time.sleep(3)
+                self._wait_for(_MESSAGE_OPEN_JS, timeout=3)
 
                 # Extract email data using JavaScript
-                js_extract = """
-                (() => {
-                    // Find subject - Gmail uses h2 for subject in opened email
-                    const subject = document.querySelector('h2')?.textContent ||
-                                   document.querySelector('.hP')?.textContent ||
-                                   '(No subject)';
-
-                    // Find sender - look for email attribute on sender elements
-                    const senderElem = document.querySelector('.gD[email]') ||
-                                      document.querySelector('.go[email]') ||
-                                      document.querySelector('[email]');
-                    const from = senderElem?.getAttribute('email') ||
-                                senderElem?.textContent ||
-                                '(Unknown sender)';
-
-                    // Find date - Gmail shows date in various places
-                    const dateElem = document.querySelector('.g3')?.getAttribute('title') ||
-                                    document.querySelector('[data-tooltip]')?.getAttribute('data-tooltip') ||
-                                    document.querySelector('.g3')?.textContent ||
-                                    new Date().toISOString();
-
-                    // Find email body - Gmail uses div.ii for message body
-                    const bodyElem = document.querySelector('.ii') ||
-                                    document.querySelector('.a3s');
-                    const body = bodyElem?.textContent ||
-                                '(Body not available)';
-
-                    // Find recipients - to field
-                    const toElems = document.querySelectorAll('.g2[email]');
-                    const to = Array.from(toElems)
-                        .map(el => el.getAttribute('email'))
-                        .filter(Boolean)
-                        .join(', ') || '';
-
-                    return {
-                        subject: subject.trim(),
-                        from: from.trim(),
-                        to: to.trim(),
-                        date: dateElem,
-                        body: body.trim().substring(0, 10000) // Limit body size
-                    };
-                })()
-                """
+                js_extract = f"({_READ_MESSAGE_JS})()"
 
                 result = self._run_command("eval", js_extract, expect_json=True)
                 email_data = result.get("result", {})
 
                 if not email_data or not email_data.get("subject"):
                     if attempt < max_retries - 1:
-                        print(f"  Email {row_index + 1}: Empty data, retrying...")
-                        time.sleep(2)
+                        self._log(f"  Email {row_index + 1}: Empty data, retrying...")
                         try:
                             self._run_command("back")
                         except:
                             pass
+                        self._wait_for(_LIST_READY_JS, timeout=2)
                         continue
                     else:
                         print(f"  Email {row_index + 1}: Failed after {max_retries} attempts")
@@ -290,18 +759,18 @@ class GmailBrowserExtractor:
 
                 # Go back to email list
                 self._run_command("back")
-                time.sleep(2)
+                self._wait_for(_LIST_READY_JS, timeout=2)
 
                 return email_data
 
             except Exception as e:
                 if attempt < max_retries - 1:
-                    print(f"  Email {row_index + 1}: Error, retrying: {e}")
+                    self._log(f"  Email {row_index + 1}: Error, retrying: {e}")
                     try:
                         self._run_command("back")
                     except:
                         pass
-                    time.sleep(2)
+                    self._wait_for(_LIST_READY_JS, timeout=2)
                 else:
                     print(f"  Email {row_index + 1}: Failed after {max_retries} attempts: {e}")
                     try:
@@ -312,6 +781,130 @@ class GmailBrowserExtractor:
 
         return None
 
+    def _extract_rows_by_thread_id(self, max_results: int) -> Optional[list[dict]]:
+        """
+        Extract full emails from the first rows of the current list page by URL.
+
+        Reads every row's thread id in one call, opens each thread by URL
+        with extract_email_from_row(), then returns to the list.
+
+        Args:
+            max_results: Maximum number of rows to read
+
+        Returns:
+            List of email dicts, or None if some row has no thread id
+            (callers then click the rows instead)
+        """
+        try:
+            listing = self._run_command(
+                "eval", f"({_READ_THREAD_IDS_JS})({json.dumps(max_results)})", expect_json=True
+            ).get("result") or {}
+        except AgentBrowserError:
+            return None
+        thread_ids = listing.get("ids") or []
+        if not thread_ids or not all(thread_ids):
+            return None
+
+        start_time = time.time()
+        emails = []
+        for idx, thread_id in enumerate(thread_ids):
+            # Progress indicator every 10 emails
+            if idx % 10 == 0 and idx > 0:
+                elapsed = time.time() - start_time
+                remaining = (len(thread_ids) - idx) * elapsed / idx
+                print(f"  Progress: {idx}/{len(thread_ids)} - "
+                      f"~{int(remaining // 60)}m {int(remaining % 60)}s remaining")
+
+            email_data = self.extract_email_from_row(idx, thread_id)
+            if email_data:
+                emails.append(email_data)
+
+        # Back to the list page the rows came from
+        self._run_command(
+            "eval", f"location.hash = {json.dumps(listing.get('hash') or '#inbox')}",
+            expect_json=True
+        )
+        self._wait_for(_LIST_READY_JS, timeout=5)
+        return emails
+
+    def extract_full_bodies_in_page(self, max_results: int) -> Optional[list[dict]]:
+        """
+        Extract full emails from the first rows of the current list page in one call.
+
+        The page script opens each row, waits for the message to render, reads
+        it and navigates back, so there is a single agent-browser round-trip
+        and no fixed sleeps. Rows found in the email store are not opened.
+
+        Args:
+            max_results: Maximum number of rows to read
+
+        Returns:
+            List of email dicts, or None if the in-page extraction failed
+            (callers then fall back to extract_email_from_row)
+        """
+        # Row ids, to skip rows already read on an earlier run
+        uids = [row['_page_unique_id'] for row in self._extract_emails_from_current_page(max_results)]
+        stored = self._store.get_many(uids) if self._store else {}
+        indices = [i for i, uid in enumerate(uids) if uid not in stored]
+        if not uids:
+            indices = list(range(max_results))
+        elif stored:
+            print(f"  {len(stored)} of {len(uids)} emails already read on an earlier run")
+
+        read = []
+        if indices:
+            print(f"Reading up to {len(indices)} emails in-page...")
+            try:
+                result = self._run_command(
+                    "eval", f"({_READ_ROWS_JS})({json.dumps(indices)})",
+                    expect_json=True,
+                    # Up to ~6s of waits per email
+                    timeout=30 + 6 * len(indices)
+                )
+            except AgentBrowserError as e:
+                print(f"  In-page extraction failed, falling back to per-email extraction: {e}")
+                return None
+
+            read = result.get("result")
+            if not isinstance(read, list):
+                print("  In-page extraction returned no list, falling back to per-email extraction")
+                return None
+
+        return self._merge_read_rows(uids, stored, indices, read)
+
+    def _merge_read_rows(
+        self,
+        uids: list[str],
+        stored: dict[str, dict],
+        indices: list[int],
+        read: list[Optional[dict]]
+    ) -> list[dict]:
+        """
+        Combine stored emails with the rows just read, in row order.
+
+        Newly read emails are added to the email store.
+
+        Args:
+            uids: Row ids of the page (empty if they could not be read)
+            stored: Emails already in the store, by row id
+            indices: Row indices that were opened
+            read: In-page reader results for those indices (None if not opened)
+
+        Returns:
+            List of email dicts
+        """
+        if uids:
+            by_index = dict(zip(indices, read))
+            if self._store:
+                self._store.put_many({
+                    uids[i]: email for i, email in by_index.items()
+                    if email and email.get("subject")
+                })
+            emails = [stored.get(uid) or by_index.get(i) for i, uid in enumerate(uids)]
+        else:
+            emails = read
+        return [email for email in emails if email and email.get("subject")]
+
     def _click_older_button(self) -> bool:
         """
         Find and click Gmail's [Older] pagination button.
@@ -325,39 +918,7 @@ class GmailBrowserExtractor:
         Returns:
             True if button was found and clicked, False otherwise
         """
-        js_click = """
-        (() => {
-            // Strategy 1: Find by aria-label
-            let olderBtn = Array.from(document.querySelectorAll('button, div[role="button"]'))
-                .find(btn => {
-                    const label = btn.getAttribute('aria-label') || btn.textContent || '';
-                    return label.toLowerCase().includes('older');
-                });
-
-            // Strategy 2: Find in navigation div
-            if (!olderBtn) {
-                const navDiv = document.querySelector('div[role="navigation"]');
-                if (navDiv) {
-                    const buttons = navDiv.querySelectorAll('button');
-                    if (buttons.length >= 2) {
-                        olderBtn = buttons[buttons.length - 1];  // Rightmost button
-                    }
-                }
-            }
-
-            // Strategy 3: Find by title/tooltip
-            if (!olderBtn) {
-                olderBtn = document.querySelector('[title*="Older"], [data-tooltip*="Older"]');
-            }
-
-            // Strategy 4: Check if button is enabled and click
-            if (olderBtn && olderBtn.getAttribute('aria-disabled') !== 'true') {
-                olderBtn.click();
-                return true;
-            }
-            return false;
-        })()
-        """
+        js_click = f"({_CLICK_OLDER_JS})()"
 
         try:
             result = self._run_command("eval", js_click, expect_json=True)
@@ -365,32 +926,24 @@ class GmailBrowserExtractor:
         except Exception:
             return False
 
-    def _filter_duplicates(self, existing: list[dict], new: list[dict]) -> list[dict]:
+    def _filter_duplicates(self, seen_ids: set[str], new: list[dict]) -> list[dict]:
         """
         Remove emails already in accumulated list.
 
-        Uses a temporary _page_unique_id field to identify duplicates.
+        Uses the temporary _page_unique_id field (always set by the list
+        extraction script) to identify duplicates.
 
         Args:
-            existing: List of already-accumulated emails
+            seen_ids: _page_unique_id values of already-accumulated emails;
+                updated in place with the ids of the returned emails
             new: List of newly extracted emails from current page
 
         Returns:
             List of new emails not in existing list
         """
-        if not existing:
-            return new
-
-        existing_ids = {
-            email.get('_page_unique_id', email.get('subject', '') + email.get('from', ''))
-            for email in existing
-        }
-
-        return [
-            email for email in new
-            if email.get('_page_unique_id', email.get('subject', '') + email.get('from', ''))
-            not in existing_ids
-        ]
+        new_emails = [email for email in new if email['_page_unique_id'] not in seen_ids]
+        seen_ids.update(email['_page_unique_id'] for email in new_emails)
+        return new_emails
 
     def _extract_emails_from_current_page(self, max_results: int) -> list[dict]:
         """
@@ -405,59 +958,7 @@ class GmailBrowserExtractor:
         Returns:
             List of email dicts with _page_unique_id field
         """
-        js_extract_all = f"""
-        (() => {{
-            const rows = Array.from(document.querySelectorAll('tr.zA'))
-                .filter(row => row.querySelector('td') !== null)
-                .slice(0, {max_results});
-
-            return rows.map(row => {{
-                const cells = row.querySelectorAll('td');
-
-                // Extract sender (typically cell 3 or 4)
-                const senderCell = cells[3] || cells[4];
-                const sender = senderCell?.querySelector('[email]')?.getAttribute('email') ||
-                              senderCell?.querySelector('.yP, .yW')?.innerText ||
-                              senderCell?.innerText?.trim() ||
-                              '(Unknown sender)';
-
-                // Extract subject and snippet (typically cell 4 or 5)
-                const subjectCell = cells[4] || cells[5];
-                const subjectText = subjectCell?.innerText?.trim() || '(No subject)';
-
-                // Try to separate subject from snippet
-                let subject = subjectText;
-                let snippet = '';
-                if (subjectText.includes('\\n')) {{
-                    const parts = subjectText.split('\\n');
-                    subject = parts[0];
-                    snippet = parts.slice(1).join(' ');
-                }} else {{
-                    snippet = subjectText;
-                }}
-
-                // Extract date (typically one of the last cells)
-                const dateCell = cells[cells.length - 2] || cells[cells.length - 1];
-                const date = dateCell?.querySelector('span')?.getAttribute('title') ||
-                            dateCell?.innerText?.trim() ||
-                            new Date().toISOString();
-
-                const body = snippet;
-
-                // Create unique ID for deduplication (subject||sender||date)
-                const uniqueId = subject.substring(0, 100) + '||' + sender + '||' + date;
-
-                return {{
-                    subject: subject.substring(0, 500),
-                    from: sender,
-                    to: '',  // Not available in list view
-                    date: date,
-                    body: body.substring(0, 10000),
-                    _page_unique_id: uniqueId
-                }};
-            }});
-        }})()
-        """
+        js_extract_all = f"({_READ_LIST_ROWS_JS})({json.dumps(max_results)})"
 
         try:
             result = self._run_command("eval", js_extract_all, expect_json=True)
@@ -467,6 +968,37 @@ class GmailBrowserExtractor:
             print(f"  Warning: Failed to extract emails from current page: {e}")
             return []
 
+    def _paginate_batch_js(
+        self,
+        target_count: int,
+        max_pages: int,
+        page_size: int
+    ) -> Optional[list[list[dict]]]:
+        """
+        Read list pages and click [Older] between them in one evaluation.
+
+        Args:
+            target_count: Target number of unique emails
+            max_pages: Maximum number of pages to read
+            page_size: Expected emails per page
+
+        Returns:
+            Emails of each page read, or None if the script failed
+        """
+        js = f"({_PAGINATE_JS})({json.dumps(target_count)}, {json.dumps(max_pages)}, {json.dumps(page_size)})"
+        try:
+            # Each page may wait up to 2.5s for the next one to render
+            result = self._run_command("eval", js, expect_json=True,
+                                       timeout=30 + 4 * max_pages)
+        except AgentBrowserError as e:
+            print(f"  Batched pagination failed ({e}), paging step by step")
+            return None
+
+        pages = result.get("result")
+        if not isinstance(pages, list):
+            return None
+        return pages
+
     def paginate_to_load_more_emails(
         self,
         target_count: int,
@@ -488,59 +1020,230 @@ class GmailBrowserExtractor:
             Tuple of (total_count, all_emails_list)
         """
         print(f"Loading emails via pagination (target: {target_count}, max pages: {max_pages})...")
+        start_time = time.time()
 
         accumulated_emails = []
+        seen_ids = set()
         current_page = 1
         stall_count = 0
 
+        # Read all pages in one command; None falls back to a command per step
+        pages = self._paginate_batch_js(target_count, max_pages, page_size)
+
         while len(accumulated_emails) < target_count and current_page <= max_pages:
-            print(f"  Page {current_page}: Extracting emails...")
+            if pages is not None:
+                if current_page > len(pages):
+                    print(f"  [Older] button not found or disabled, stopping")
+                    break
+                page_emails = pages[current_page - 1]
+            else:
+                self._log(f"  Page {current_page}: Extracting emails...")
 
-            # Extract emails from current page
-            page_emails = self._extract_emails_from_current_page(
-                max_results=min(page_size, target_count - len(accumulated_emails))
-            )
+                # Extract emails from current page
+                page_emails = self._extract_emails_from_current_page(
+                    max_results=min(page_size, target_count - len(accumulated_emails))
+                )
 
             if not page_emails:
                 print(f"  Page {current_page}: No emails found, stopping")
                 break
 
             # Filter duplicates
-            new_emails = self._filter_duplicates(accumulated_emails, page_emails)
+            new_emails = self._filter_duplicates(seen_ids, page_emails)
 
             # Detect stalls (no new emails)
             if not new_emails:
                 stall_count += 1
-                print(f"  Page {current_page}: No new emails (stall count: {stall_count})")
+                self._log(f"  Page {current_page}: No new emails (stall count: {stall_count})")
                 if stall_count >= 2:
                     print(f"  No new emails after {stall_count} pages, stopping")
                     break
             else:
                 accumulated_emails.extend(new_emails)
                 stall_count = 0
-                print(f"  Page {current_page}: Added {len(new_emails)} new emails (total: {len(accumulated_emails)})")
+                self._log(f"  Page {current_page}: Added {len(new_emails)} new emails (total: {len(accumulated_emails)})")
 
             # Check if target reached
             if len(accumulated_emails) >= target_count:
                 print(f"  Target reached: {len(accumulated_emails)} emails")
                 break
 
-            # Click [Older] button to next page
-            print(f"  Page {current_page}: Clicking [Older] button...")
-            if not self._click_older_button():
-                print(f"  [Older] button not found or disabled, stopping")
-                break
+            if pages is None:
+                # Click [Older] button to next page
+                self._log(f"  Page {current_page}: Clicking [Older] button...")
+                if not self._click_older_button():
+                    print(f"  [Older] button not found or disabled, stopping")
+                    break
 
-            time.sleep(2.5)  # Wait for page load
+                self._wait_for(_PAGE_CHANGED_JS, timeout=2.5)  # Wait for page load
             current_page += 1
 
-        print(f"Pagination complete: {len(accumulated_emails)} emails across {current_page} pages")
+        print(f"Pagination complete: {len(accumulated_emails)} emails across {current_page} pages "
+              f"in {time.time() - start_time:.1f}s")
         return len(accumulated_emails), accumulated_emails
 
+    def _extract_full_body_pages_parallel(
+        self,
+        max_results: int,
+        max_pages: int,
+        workers: int
+    ) -> list[dict]:
+        """
+        Extract full email bodies from several list pages at once.
+
+        Each worker is its own agent-browser session (session name suffixed
+        _w1, _w2, ...; each asks for a login on first use) that opens its
+        pages directly by URL and reads them in-page. Worker w reads pages
+        w+1, w+1+workers, ...
+
+        Args:
+            max_results: Maximum number of emails to extract
+            max_pages: Maximum number of pages to read
+            workers: Number of browser sessions, this extractor included
+
+        Returns:
+            List of email dicts with full body content, in page order
+        """
+        # Pages hold up to 50 rows; read no more than the results need
+        pages = min(max_pages, -(-max_results // 50))
+        workers = min(workers, pages)
+        base_url = self._opened_url.split("#")[0].rstrip("/")
+
+        extractors = [self]
+        for w in range(1, workers):
+            extractor = GmailBrowserExtractor(
+                session_name=f"{self.session_name}_w{w}",
+                headless=self.headless,
+                use_store=False,
+                verbose=self.verbose
+            )
+            # Share this session's store, through a connection of its own
+            if self._store:
+                extractor._store = EmailStore(
+                    self.session_name, self._store.cache_dir, self._store.max_age / 86400
+                )
+            # One at a time: a login prompt waits for input
+            extractor.open_gmail(self._opened_url)
+            extractors.append(extractor)
+
+        def read_pages(worker: int) -> dict[int, list[dict]]:
+            extractor = extractors[worker]
+            read = {}
+            try:
+                for page in range(worker + 1, pages + 1, workers):
+                    extractor._run_command("open", f"{base_url}/#inbox/p{page}", timeout=60)
+                    extractor._wait_for(_LIST_READY_JS, timeout=5)
+                    emails = extractor.extract_full_bodies_in_page(50)
+                    if not emails:
+                        break
+                    read[page] = emails
+                    extractor._log(f"  Page {page}: {len(emails)} emails (worker {worker})")
+            except (AgentBrowserError, sqlite3.Error) as e:
+                # e.g. "database is locked" from the shared store; the
+                # pages read so far are kept
+                print(f"  Worker {worker} stopped: {e}")
+            return read
+
+        print(f"\nExtracting up to {max_results} emails with full bodies "
+              f"across {pages} pages with {workers} browser sessions...")
+        start_time = time.time()
+
+        by_page = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for read in pool.map(read_pages, range(workers)):
+                by_page.update(read)
+
+        # Pages after a missing one may belong to a different listing
+        emails = []
+        for page in range(1, pages + 1):
+            if page not in by_page:
+                break
+            emails.extend(by_page[page])
+
+        elapsed = time.time() - start_time
+        print(f"\nExtraction complete: {len(emails[:max_results])} emails in "
+              f"{int(elapsed // 60)}m {int(elapsed % 60)}s")
+        return emails[:max_results]
+
+    def _extract_full_body_pages_tabs(
+        self,
+        max_results: int,
+        max_pages: int,
+        tabs: int
+    ) -> list[dict]:
+        """
+        Extract full email bodies from several list pages at once, one tab each.
+
+        Playwright backend only. The tabs share the browser context, and so
+        the login. Each round opens up to `tabs` pages by URL and starts the
+        in-page reader in every tab without waiting for it, then collects
+        the results, so the tabs read their pages concurrently.
+
+        Args:
+            max_results: Maximum number of emails to extract
+            max_pages: Maximum number of pages to read
+            tabs: Number of tabs
+
+        Returns:
+            List of email dicts with full body content, in page order
+        """
+        # Pages hold up to 50 rows; read no more than the results need
+        pages = min(max_pages, -(-max_results // 50))
+        tabs = min(tabs, pages)
+        base_url = self._opened_url.split("#")[0].rstrip("/")
+
+        print(f"\nExtracting up to {max_results} emails with full bodies "
+              f"across {pages} pages in {tabs} tabs...")
+        start_time = time.time()
+
+        emails = []
+        tab_pages = [self._context.new_page() for _ in range(tabs)]
+        try:
+            for first in range(1, pages + 1, tabs):
+                started = []
+                for tab, page in zip(tab_pages, range(first, pages + 1)):
+                    try:
+                        tab.goto(f"{base_url}/#inbox/p{page}", timeout=60000)
+                        tab.wait_for_function(_LIST_READY_JS, polling="mutation", timeout=5000)
+                    except PlaywrightError:
+                        # Past the last page
+                        break
+                    rows = tab.evaluate(f"({_READ_LIST_ROWS_JS})(50)")
+                    uids = [row['_page_unique_id'] for row in rows]
+                    stored = self._store.get_many(uids) if self._store else {}
+                    indices = [i for i, uid in enumerate(uids) if uid not in stored]
+                    # Started but not awaited, so all tabs read at once
+                    tab.evaluate(f"window.__agentRead = ({_READ_ROWS_JS})({json.dumps(indices)}), 0")
+                    started.append((page, tab, uids, stored, indices))
+
+                for page, tab, uids, stored, indices in started:
+                    # Evaluating the stored promise waits for it to settle
+                    read = tab.evaluate("window.__agentRead")
+                    page_emails = self._merge_read_rows(uids, stored, indices, read)
+                    self._log(f"  Page {page}: {len(page_emails)} emails")
+                    emails.extend(page_emails)
+
+                if len(started) < len(tab_pages) or len(emails) >= max_results:
+                    break
+        except PlaywrightError as e:
+            print(f"  Tab extraction stopped: {e}")
+        finally:
+            for tab in tab_pages:
+                try:
+                    tab.close()
+                except PlaywrightError:
+                    pass
+
+        elapsed = time.time() - start_time
+        print(f"\nExtraction complete: {len(emails[:max_results])} emails in "
+              f"{int(elapsed // 60)}m {int(elapsed % 60)}s")
+        return emails[:max_results]
+
     def extract_emails_with_pagination_full_body(
         self,
         max_results: int,
-        max_pages: int = 20
+        max_pages: int = 20,
+        workers: int = 1
     ) -> list[dict]:
         """
         Extract full email bodies with pagination.
@@ -551,10 +1254,19 @@ class GmailBrowserExtractor:
         Args:
             max_results: Maximum number of emails to extract
             max_pages: Maximum number of pages to navigate
+            workers: Browser sessions reading pages in parallel, or tabs
+                with the Playwright backend (default: 1)
 
         Returns:
             List of email dicts with full body content
         """
+        if workers > 1 and self._opened_url:
+            # Playwright's sync API can't be shared across worker threads,
+            # but its tabs can read concurrently
+            if self._page is not None:
+                return self._extract_full_body_pages_tabs(max_results, max_pages, workers)
+            return self._extract_full_body_pages_parallel(max_results, max_pages, workers)
+
         print(f"\nExtracting up to {max_results} emails with full bodies across {max_pages} pages...")
         print(f"Expected time: ~{(max_results * 3) // 60} minutes\n")
 
@@ -566,13 +1278,7 @@ class GmailBrowserExtractor:
             print(f"\n--- Page {current_page} ---")
 
             # Count emails on page
-            js_count = """
-            (() => {
-                const rows = Array.from(document.querySelectorAll('tr.zA'))
-                    .filter(row => row.querySelector('td') !== null);
-                return rows.length;
-            })()
-            """
+            js_count = f"({_COUNT_ROWS_JS})()"
             result = self._run_command("eval", js_count, expect_json=True)
             page_count = result.get("result", 0)
 
@@ -584,19 +1290,26 @@ class GmailBrowserExtractor:
             emails_to_extract = min(page_count, max_results - len(accumulated_emails))
             print(f"  Extracting {emails_to_extract} emails from page {current_page}")
 
-            for idx in range(emails_to_extract):
-                email_data = self.extract_email_from_row(idx)
-                if email_data:
-                    accumulated_emails.append(email_data)
+            page_emails = self.extract_full_bodies_in_page(emails_to_extract)
+            if page_emails is None:
+                page_emails = self._extract_rows_by_thread_id(emails_to_extract)
+            if page_emails is not None:
+                accumulated_emails.extend(page_emails)
+                print(f"    Total: {len(accumulated_emails)}/{max_results}")
+            else:
+                for idx in range(emails_to_extract):
+                    email_data = self.extract_email_from_row(idx)
+                    if email_data:
+                        accumulated_emails.append(email_data)
 
-                # Progress
-                if len(accumulated_emails) % 10 == 0 and len(accumulated_emails) > 0:
-                    elapsed = time.time() - start_time
-                    progress_pct = int((len(accumulated_emails) / max_results) * 100)
-                    avg_time = elapsed / len(accumulated_emails)
-                    remaining = (max_results - len(accumulated_emails)) * avg_time
-                    print(f"    Total: {len(accumulated_emails)}/{max_results} ({progress_pct}%) - "
-                          f"~{int(remaining // 60)}m {int(remaining % 60)}s remaining")
+                    # Progress
+                    if len(accumulated_emails) % 10 == 0 and len(accumulated_emails) > 0:
+                        elapsed = time.time() - start_time
+                        progress_pct = int((len(accumulated_emails) / max_results) * 100)
+                        avg_time = elapsed / len(accumulated_emails)
+                        remaining = (max_results - len(accumulated_emails)) * avg_time
+                        print(f"    Total: {len(accumulated_emails)}/{max_results} ({progress_pct}%) - "
+                              f"~{int(remaining // 60)}m {int(remaining % 60)}s remaining")
 
             if len(accumulated_emails) >= max_results:
                 break
@@ -607,7 +1320,7 @@ class GmailBrowserExtractor:
                 print(f"  [Older] button not found, stopping")
                 break
 
-            time.sleep(3)
+            self._wait_for(_PAGE_CHANGED_JS, timeout=3)
             current_page += 1
 
         elapsed = time.time() - start_time
@@ -659,13 +1372,21 @@ class GmailBrowserExtractor:
             print(f"Successfully extracted {len(all_emails)} emails across multiple pages")
             return all_emails[:max_results]
 
-    def extract_emails(self, max_results: int = 10, include_body: bool = False) -> list[dict]:
+    def extract_emails(
+        self,
+        max_results: int = 10,
+        include_body: bool = False,
+        workers: int = 1
+    ) -> list[dict]:
         """
         Extract multiple emails from Gmail inbox.
 
         Args:
             max_results: Maximum number of emails to extract
             include_body: If True, click each email to get full body (slower)
+            workers: Browser sessions (or Playwright tabs) for multi-page
+                full-body extraction (default: 1; each extra agent-browser
+                session needs its own login, tabs share one)
 
         Returns:
             List of email dicts
@@ -677,25 +1398,44 @@ class GmailBrowserExtractor:
                 print(f"\nExtracting {max_results} emails with full bodies...")
                 print(f"Expected time: ~{(max_results * 3) // 60} minutes\n")
 
-                # Get email row count
-                email_selectors = self.get_email_list_elements(max_results)
+                start_time = time.time()
 
+                # Open and read every row inside the page in one command
+                emails = self.extract_full_bodies_in_page(max_results)
+                if emails is not None:
+                    elapsed = time.time() - start_time
+                    print(f"\nExtracted {len(emails)} emails in {int(elapsed // 60)}m {int(elapsed % 60)}s")
+                    return emails
+
+                # Fall back to opening each thread by URL
+                emails = self._extract_rows_by_thread_id(max_results)
+                if emails is not None:
+                    elapsed = time.time() - start_time
+                    print(f"\nExtracted {len(emails)} emails in {int(elapsed // 60)}m {int(elapsed % 60)}s")
+                    return emails
+
+                # Otherwise click each row; the row count comes back with
+                # the first click
                 emails = []
-                start_time = time.time()
+                total = max_results
+                idx = 0
 
-                for idx in range(len(email_selectors)):
+                while idx < total:
                     # Progress indicator every 10 emails
                     if idx % 10 == 0 and idx > 0:
                         elapsed = time.time() - start_time
-                        progress_pct = int((idx / len(email_selectors)) * 100)
+                        progress_pct = int((idx / total) * 100)
                         avg_time = elapsed / idx
-                        remaining = (len(email_selectors) - idx) * avg_time
-                        print(f"  Progress: {idx}/{len(email_selectors)} ({progress_pct}%) - "
+                        remaining = (total - idx) * avg_time
+                        print(f"  Progress: {idx}/{total} ({progress_pct}%) - "
                               f"~{int(remaining // 60)}m {int(remaining % 60)}s remaining")
 
                     email_data = self.extract_email_from_row(idx)
                     if email_data:
                         emails.append(email_data)
+                    if self._list_row_count is not None:
+                        total = min(self._list_row_count, max_results)
+                    idx += 1
 
                 elapsed = time.time() - start_time
                 print(f"\nExtracted {len(emails)} emails in {int(elapsed // 60)}m {int(elapsed % 60)}s")
@@ -705,7 +1445,8 @@ class GmailBrowserExtractor:
                 max_pages = min((max_results // 50) + 2, 25)
                 return self.extract_emails_with_pagination_full_body(
                     max_results=max_results,
-                    max_pages=max_pages
+                    max_pages=max_pages,
+                    workers=workers
                 )
         else:
             # Fast method: extract from list directly
@@ -747,12 +1488,12 @@ def main():
 
         # Save to file
         output_file = "/tmp/gmail_browser_test.json"
-        with open(output_file, 'w') as f:
-            json.dump({
-                "status": "success",
-                "count": len(emails),
-                "emails": emails
-            }, f, indent=2)
+        output = {
+            "status": "success",
+            "count": len(emails),
+            "emails": emails
+        }
+        Path(output_file).write_bytes(_dumps(output, pretty=True))
         print(f"\nSaved to: {output_file}")
 
     except Exception as e:
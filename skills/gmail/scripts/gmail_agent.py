@@ -138,6 +138,21 @@ def main():
         default='claude-sonnet-4-20250514',
         help='LLM model to use (default: claude-sonnet-4-20250514)'
     )
+    parser.add_argument(
+        '--cheap-model',
+        type=str,
+        default='claude-haiku-4-5-20251001',
+        help='Model for plans that do not run the security workflows '
+             '(security_triage, detect_attack_chains, phishing_analysis) '
+             '(default: claude-haiku-4-5-20251001; pass the --model value to disable routing)'
+    )
+
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=None,
+        help='Parallel workers for parallel_* plans (default: auto-tuned to dataset size and context window)'
+    )
 
     # Output options
     parser.add_argument(
@@ -147,6 +162,11 @@ def main():
         default='text',
         help='Output format (default: text)'
     )
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Indent JSON output for reading (default: compact)'
+    )
     parser.add_argument(
         '--debug',
         action='store_true',
@@ -176,7 +196,10 @@ def main():
         agent = AgentCore(
             model=args.model,
             output_format=args.format,
-            debug=args.debug
+            debug=args.debug,
+            cheap_model=args.cheap_model,
+            max_workers=args.max_workers,
+            pretty_json=args.pretty
         )
     except Exception as e:
         print(f"Error initializing agent: {e}", file=sys.stderr)
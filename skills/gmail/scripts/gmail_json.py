@@ -0,0 +1,30 @@
+"""
+JSON helpers shared by the browser extraction scripts.
+
+Uses orjson when it is installed (the `fast` extra) and the stdlib json
+module otherwise.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json is used otherwise
+    orjson = None
+
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj as compact (or indented) JSON bytes."""
+    if orjson is not None:
+        if pretty:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        return orjson.dumps(obj)
+    return json.dumps(obj, indent=2 if pretty else None).encode('utf-8')
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
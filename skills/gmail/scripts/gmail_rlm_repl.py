@@ -55,6 +55,7 @@ import os
 import re
 import subprocess
 import sys
+import threading
 import urllib.request
 import uuid
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -177,6 +178,7 @@ MODEL_PRICING = {
     "claude-3-opus-20240229": {"input": 15.00, "output": 75.00},
     "claude-sonnet-4-20250514": {"input": 3.00, "output": 15.00},
     "claude-haiku-4-20250514": {"input": 1.00, "output": 5.00},
+    "claude-haiku-4-5-20251001": {"input": 1.00, "output": 5.00},
     # Local model - free (no API cost)
     "__local__": {"input": 0.0, "output": 0.0},
 }
@@ -240,6 +242,8 @@ Your role:
 # Global to store final result
 _final_result = None
 _final_set = False
+# Unstringified FINAL()/FINAL_VAR() value, returned as-is by --server
+_final_value = None
 
 # Global default for RLM framing (can be disabled via CLI)
 _default_use_rlm_framing = True
@@ -816,9 +820,10 @@ def FINAL(result: str):
         summaries = [...]
         FINAL('## Summary\\n' + '\\n'.join(summaries))
     """
-    global _final_result, _final_set
+    global _final_result, _final_set, _final_value
     if not _final_set:
         _final_result = str(result)
+        _final_value = result
         _final_set = True
 
 
@@ -835,10 +840,11 @@ def FINAL_VAR(var_name: str):
         categories = {'urgent': [...], 'fyi': [...]}
         FINAL_VAR('categories')
     """
-    global _final_result, _final_set, _exec_globals
+    global _final_result, _final_set, _final_value, _exec_globals
     if not _final_set:
         if var_name in _exec_globals:
             value = _exec_globals[var_name]
+            _final_value = value
             try:
                 _final_result = json.dumps(value, indent=2, default=str)
             except:
@@ -1005,11 +1011,12 @@ def execute_rlm_code(
     Returns:
         Final result string
     """
-    global _final_result, _final_set, _exec_globals
+    global _final_result, _final_set, _final_value, _exec_globals
 
     # Reset state
     _final_result = None
     _final_set = False
+    _final_value = None
 
     # Create workflow functions with injected dependencies
     inbox_triage = create_inbox_triage(llm_query, parallel_map)
@@ -1176,6 +1183,96 @@ def execute_rlm_code(
         return f"[Execution Error: {type(e).__name__}: {str(e)}]"
 
 
+def _handle_server_request(request: dict, args) -> dict:
+    """Run one --server request and return the same payload as --json-output."""
+    global _default_model
+    model = request.get("model") or args.model
+    _default_model = model
+    reset_session(
+        model=model,
+        max_budget_usd=request.get("max_budget", args.max_budget),
+        max_calls=request.get("max_calls", args.max_calls),
+        max_depth=request.get("max_depth", args.max_depth)
+    )
+
+    if request.get("load_file"):
+        emails, metadata = load_emails_from_file(request["load_file"])
+    else:
+        emails, metadata = fetch_emails_for_repl(
+            query=request["query"],
+            max_results=request.get("max_results", args.max_results),
+            format_type=request.get("format", args.format),
+            verbose=args.verbose
+        )
+
+    result = execute_rlm_code(request["code"], emails, metadata, args.verbose)
+    if _final_set and isinstance(_final_value, (dict, list)):
+        # Structured results go into the JSON response as-is, not str()'d
+        result = _final_value
+
+    return {
+        "status": "success",
+        "result": result,
+        "emails_processed": len(emails),
+        "query": metadata.get('query', ''),
+        "session": get_session().to_dict()
+    }
+
+
+def serve_requests(args) -> None:
+    """
+    Serve RLM requests over stdin/stdout until stdin is closed (--server).
+
+    Each request is one JSON line with keys: code, query or load_file, and
+    optionally max_results, max_budget, max_calls, max_depth, model, format.
+    While a request runs, status messages are streamed as
+    {"event": "progress", "message": ...} lines. The request ends with one
+    response line in the --json-output format (or an error dict), except
+    that a dict or list passed to FINAL()/FINAL_VAR() is sent as a JSON
+    value rather than a string. Keeping one process alive lets callers skip
+    interpreter startup and the Anthropic/Gmail imports on every request.
+
+    Args:
+        args: Parsed command-line arguments (defaults for request fields)
+    """
+    global status_start, status_done, status_async
+
+    out = sys.stdout
+    out_lock = threading.Lock()
+    # Stdout carries only protocol lines; route any other output to stderr
+    sys.stdout = sys.stderr
+
+    def write_line(obj: dict) -> None:
+        line = json.dumps(obj, default=str) + "\n"
+        with out_lock:
+            out.write(line)
+            out.flush()
+
+    def progress(symbol: str) -> Callable[[str], None]:
+        def report(message: str) -> None:
+            write_line({"event": "progress", "message": f"{symbol} {message}"})
+        return report
+
+    # Stream status updates to the caller instead of stderr
+    status_start = progress("→")
+    status_done = progress("✓")
+    status_async = progress("⟳")
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            response = _handle_server_request(json.loads(line), args)
+        except FileNotFoundError as e:
+            response = {"status": "error", "error_type": "MissingCredentials", "message": str(e)}
+        except HttpError as error:
+            response = {"status": "error", "error_type": "APIError", "message": f"Gmail API error: {error.reason}"}
+        except Exception as e:
+            response = {"status": "error", "error_type": "RLMError", "message": str(e)}
+
+        write_line(response)
+
+
 def check_anthropic_api_key() -> bool:
     """Check if ANTHROPIC_API_KEY is set and valid. Skipped when using a local model."""
     if _local_model_url:
@@ -1340,8 +1437,7 @@ Example:
     parser.add_argument(
         "--code",
         type=str,
-        required=True,
-        help="Python code to execute in RLM environment"
+        help="Python code to execute in RLM environment ('-' reads it from stdin)"
     )
 
     parser.add_argument(
@@ -1482,8 +1578,22 @@ Example:
         help="Force execution even if RLM mode may be overkill (suppress warnings)"
     )
 
+    parser.add_argument(
+        "--server",
+        action="store_true",
+        help="Serve line-delimited JSON requests on stdin/stdout (used by the agent)"
+    )
+
     args = parser.parse_args()
 
+    if not args.server and not args.code and not args.code_file:
+        print(json.dumps({
+            "status": "error",
+            "error_type": "ValidationError",
+            "message": "Either --code or --code-file is required"
+        }), file=sys.stderr)
+        sys.exit(1)
+
     # Validate source-specific arguments
     if args.source == "browser":
         if not args.webmail_url:
@@ -1508,7 +1618,7 @@ Example:
             print(f"   Expected time: ~{(args.max_results * 3) // 60} minutes", file=sys.stderr)
             print("   Consider using snippet mode (remove --full-body) for faster extraction\n", file=sys.stderr)
     elif args.source == "gmail":
-        if not args.query and not args.load_file:
+        if not args.query and not args.load_file and not args.server:
             print(json.dumps({
                 "status": "error",
                 "error_type": "ValidationError",
@@ -1600,6 +1710,10 @@ Example:
     else:
         init_cache(cache_dir=args.cache_dir, ttl_hours=args.cache_ttl)
 
+    if args.server:
+        serve_requests(args)
+        sys.exit(0)
+
     # Load code
     if args.code_file:
         code_path = Path(args.code_file)
@@ -1607,6 +1721,9 @@ Example:
             print(format_error("FileNotFound", f"Code file not found: {args.code_file}"), file=sys.stderr)
             sys.exit(1)
         code = code_path.read_text()
+    elif args.code == "-":
+        # Avoids argv size limits (ARG_MAX) for large generated code
+        code = sys.stdin.read()
     else:
         code = args.code
 